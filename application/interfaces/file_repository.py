@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import List, Optional, Protocol
 
 from domain.entity import FileEntity
 
@@ -11,7 +11,11 @@ class FileRepository(Protocol):
     storage, cloud storage like S3) must implement.
 
     The key responsibility of this port is to provide a method for saving file chunks
-    progressively, allowing large files to be saved in smaller parts (chunks).
+    progressively, allowing large files to be saved in smaller parts (chunks), either
+    sliced from a file already held in memory or appended as they arrive from a stream.
+    Chunks are written to a new, unpublished version of the file, which replaces the
+    stored file only when `publish` is called, or is thrown away by `discard`; a failed
+    or abandoned upload therefore never damages the previous version.
 
     This abstraction enables the application to interact with different storage
     mechanisms without being tied to a specific storage implementation.
@@ -24,7 +28,9 @@ class FileRepository(Protocol):
         This method must be implemented by any class that inherits from FileRepository.
         It is responsible for saving part of a file, starting at a specific offset, with a
         defined chunk size. This allows the file to be uploaded or saved in multiple chunks,
-        improving memory efficiency for large files.
+        improving memory efficiency for large files. A chunk at offset 0 starts a new
+        version of the file, so that uploading the same filename twice never
+        concatenates the two; the version replaces the stored file on `publish`.
 
         Args:
             file_entity (FileEntity): The file entity containing file metadata and content.
@@ -35,3 +41,83 @@ class FileRepository(Protocol):
             NotImplementedError: If the method is not implemented by the subclass.
         """
         ...
+
+    def append_chunk(self, filename: str, position: int, data: bytes, total_size: Optional[int] = None) -> None:
+        """
+        Write a chunk of streamed data at a position in the stored file.
+
+        Unlike `save_file_chunk`, the caller does not hold the whole file; chunks arrive
+        in order as they are received. A chunk at position 0 starts a new version of the
+        file, and each following chunk continues at the position where the previous one
+        ended; the version replaces the stored file on `publish`.
+
+        Args:
+            filename (str): The name of the file being written.
+            position (int): The byte position in the file at which `data` starts.
+            data (bytes): The chunk of file content.
+            total_size (Optional[int]): The final size of the file, if known in advance.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by the subclass.
+        """
+        ...
+
+    def publish(self, filename: str) -> None:
+        """
+        Replace the stored file with the version written since the last chunk at
+        position 0, atomically: readers see either the previous file or the whole new one.
+
+        Args:
+            filename (str): The name of the file whose new version is complete.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by the subclass.
+        """
+        ...
+
+    def discard(self, filename: str) -> None:
+        """
+        Throw away the unpublished version of a file, e.g. after a failed or abandoned
+        upload, leaving the stored file as it was. Does nothing if there is none.
+
+        Args:
+            filename (str): The name of the file whose new version is abandoned.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by the subclass.
+        """
+        ...
+
+    def sync_staged(self, filenames: List[str]) -> None:
+        """
+        Make the unpublished versions of the given files durable.
+
+        This method must be implemented by any class that inherits from FileRepository.
+        It is called by the durability policy before `publish`, so that a crash can
+        never keep a published version whose data was lost. Repositories whose storage
+        already orders the data before the publish may do nothing.
+
+        Args:
+            filenames (List[str]): The names of the files about to be published.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by the subclass.
+        """
+        ...
+
+    def sync(self, filenames: List[str]) -> None:
+        """
+        Make the data previously written and published for the given files durable.
+
+        This method must be implemented by any class that inherits from FileRepository.
+        It is called once per upload, or once per batch of uploads, by the durability
+        policy after `publish`; when it returns, the files must survive a crash or power
+        loss. Writes themselves need not be durable, so chunks are never synced one by one.
+
+        Args:
+            filenames (List[str]): The names of the files to make durable.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by the subclass.
+        """
+        ...
@@ -0,0 +1,284 @@
+"""
+Module: upload_coordinator
+
+This module defines the `UploadCoordinator` class, which coordinates concurrent
+uploads of the same filename before they reach the file repository.
+
+Two uploads writing the same filename at once would interleave their chunks, so only
+one writer per filename is allowed at a time; later writers either wait their turn
+(`serialize`) or are refused with an `UploadConflictError` (`reject`). An upload that is
+identical to the newest upload claimed for its filename, matched by either content
+digest or size, is not written again: it waits for that upload and shares its outcome
+("singleflight"). Only the newest claim is joined, since the file ends up with whatever
+was written last. Since only an upload arriving while its filename is busy can be
+collapsed, its fingerprint, which may cost a full SHA-256 pass, can be given as a
+coroutine function that is only called then. Counters of how often each of these
+happens are kept for inspection.
+
+Example Use Case:
+    - Clients retrying an upload during an incident no longer double the write load,
+      because the retry joins the original upload instead of writing the file again.
+"""
+import asyncio
+import hashlib
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Union
+
+# The identity of an upload's content, or a coroutine function computing it on demand.
+Fingerprint = Union[None, str, Callable[[], Awaitable[Optional[str]]]]
+
+
+class UploadConflictError(Exception):
+    """
+    Raised when another upload of the same filename is already being written and the
+    coordinator is configured to reject conflicting writers.
+    """
+
+
+class _Flight:
+    """
+    The shared outcome of an upload that identical concurrent uploads wait on.
+    """
+
+    def __init__(self, fingerprint: Fingerprint = None) -> None:
+        self.done = asyncio.Event()
+        self.error: Optional[BaseException] = None
+        self._fingerprint = fingerprint
+        self._resolving: Optional[asyncio.Future] = None
+
+    async def fingerprint(self) -> Optional[str]:
+        """
+        Returns the identity of the flight's content, computing it on first use only;
+        concurrent callers share a single computation.
+        """
+        if not callable(self._fingerprint):
+            return self._fingerprint
+        if self._resolving is None:
+            self._resolving = asyncio.ensure_future(self._fingerprint())
+        # Shielded so that a cancelled caller does not cancel it for the others.
+        return await asyncio.shield(self._resolving)
+
+    async def wait(self) -> None:
+        await self.done.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class UploadClaim:
+    """
+    UploadClaim is the right to perform, or to share the result of, one upload.
+
+    A leader claim holds the filename's writer lock and must write the file, then call
+    `release`. A follower claim joined an identical upload in flight and only calls `wait`.
+
+    Attributes:
+        leader (bool): Whether this claim must perform the write.
+    """
+
+    def __init__(self, coordinator: 'UploadCoordinator', filename: str,
+                 flight: _Flight, leader: bool) -> None:
+        self.leader = leader
+        self._coordinator = coordinator
+        self._filename = filename
+        self._flight = flight
+        self._released = False
+
+    async def wait(self) -> None:
+        """
+        Waits for the upload this follower joined, re-raising its error if it failed.
+        """
+        await self._flight.wait()
+
+    def release(self, error: Optional[BaseException] = None) -> None:
+        """
+        Ends a leader's write, sharing its outcome with the followers and letting the next
+        writer of the filename proceed. Calling it more than once has no effect.
+
+        Args:
+            error (Optional[BaseException]): The error the write failed with, if any.
+        """
+        if not self.leader or self._released:
+            return
+        self._released = True
+        self._flight.error = error
+        self._flight.done.set()
+        self._coordinator._release(self._filename, self._flight)
+
+
+class UploadCoordinator:
+    """
+    UploadCoordinator serializes or rejects concurrent writers of a filename and collapses
+    an upload identical to the newest one claimed for its filename into that write.
+
+    Attributes:
+        SERIALIZE (str): Conflicting writers wait for the current writer to finish.
+        REJECT (str): Conflicting writers fail with UploadConflictError.
+        DEDUP_DIGEST (str): Uploads are identical if filename and SHA-256 digest match.
+        DEDUP_SIZE (str): Uploads are identical if filename and size match.
+        DEDUP_OFF (str): Uploads are never collapsed.
+        conflict_mode (str): SERIALIZE or REJECT.
+        dedup (str): DEDUP_DIGEST, DEDUP_SIZE or DEDUP_OFF.
+        counters (Dict[str, int]): How many uploads were written, collapsed, waited or rejected.
+    """
+
+    SERIALIZE = "serialize"
+    REJECT = "reject"
+    DEDUP_DIGEST = "digest"
+    DEDUP_SIZE = "size"
+    DEDUP_OFF = "off"
+
+    def __init__(self, conflict_mode: str = SERIALIZE, dedup: str = DEDUP_DIGEST) -> None:
+        """
+        Initialize the UploadCoordinator.
+
+        Args:
+            conflict_mode (str): SERIALIZE or REJECT.
+            dedup (str): DEDUP_DIGEST, DEDUP_SIZE or DEDUP_OFF.
+
+        Raises:
+            ValueError: If either mode is not supported.
+        """
+        if conflict_mode not in (self.SERIALIZE, self.REJECT):
+            raise ValueError(f"Unknown conflict mode '{conflict_mode}'")
+        if dedup not in (self.DEDUP_DIGEST, self.DEDUP_SIZE, self.DEDUP_OFF):
+            raise ValueError(f"Unknown dedup mode '{dedup}'")
+
+        self.conflict_mode = conflict_mode
+        self.dedup = dedup
+        self.counters: Dict[str, int] = {"written": 0, "collapsed": 0, "waited": 0, "rejected": 0}
+
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._holders: Dict[str, int] = defaultdict(int)
+        # The flight of the newest claim per filename, the only one that may be joined.
+        self._latest: Dict[str, _Flight] = {}
+
+    async def fingerprint(self, content: bytes) -> Optional[str]:
+        """
+        Returns the identity of an upload's content under the dedup mode, if any. The
+        digest is computed in a worker thread so large files do not block the event loop.
+
+        Args:
+            content (bytes): The complete file content.
+        """
+        if self.dedup == self.DEDUP_DIGEST:
+            return "sha256:" + await asyncio.to_thread(lambda: hashlib.sha256(content).hexdigest())
+        return self.stream_fingerprint(len(content))
+
+    def stream_fingerprint(self, total_size: Optional[int]) -> Optional[str]:
+        """
+        Returns the identity of a streamed upload, whose digest is unknown until it ends,
+        so only size-based dedup applies.
+
+        Args:
+            total_size (Optional[int]): The announced size of the stream, if known.
+        """
+        if self.dedup == self.DEDUP_SIZE and total_size is not None:
+            return f"size:{total_size}"
+        return None
+
+    async def claim(self, filename: str, fingerprint: Fingerprint = None) -> UploadClaim:
+        """
+        Claims an upload of `filename`: joins the newest upload claimed for the filename
+        as a follower if it is identical, or becomes a writer of the filename as a leader,
+        waiting for or rejecting on the current writer according to `conflict_mode`.
+        A fingerprint given as a coroutine function is only called if the filename is
+        busy, and at most once.
+
+        Args:
+            filename (str): The name of the file to upload.
+            fingerprint (Fingerprint): The identity of the content, a coroutine function
+                                       computing it, or None to never collapse.
+
+        Returns:
+            UploadClaim: The claim; leaders must `release` it once the write ends.
+
+        Raises:
+            UploadConflictError: If another writer holds the filename in REJECT mode.
+        """
+        flight = _Flight(fingerprint)
+        latest = self._latest.get(filename)
+        if latest is not None:
+            identity = await flight.fingerprint()
+            # The newest upload may have ended or been superseded while computing.
+            if (identity is not None and identity == await latest.fingerprint()
+                    and self._latest.get(filename) is latest):
+                self.counters["collapsed"] += 1
+                return UploadClaim(self, filename, latest, leader=False)
+
+        lock = self._locks.setdefault(filename, asyncio.Lock())
+        if lock.locked():
+            if self.conflict_mode == self.REJECT:
+                self.counters["rejected"] += 1
+                raise UploadConflictError(f"File '{filename}' is already being uploaded")
+            self.counters["waited"] += 1
+
+        # Queued behind older writers, this upload now decides the file's final content.
+        self._latest[filename] = flight
+
+        self._holders[filename] += 1
+        try:
+            await lock.acquire()
+        except BaseException as exception:
+            # Cancelled while waiting: fail any followers that joined this flight.
+            flight.error = exception
+            flight.done.set()
+            self._release(filename, flight, locked=False)
+            raise
+
+        self.counters["written"] += 1
+        return UploadClaim(self, filename, flight, leader=True)
+
+    async def run(self, filename: str, fingerprint: Fingerprint,
+                  upload: Callable[[], Awaitable[None]]) -> None:
+        """
+        Performs `upload` under a claim on `filename`, or shares the outcome of the
+        newest upload of the filename if it is identical.
+
+        Args:
+            filename (str): The name of the file to upload.
+            fingerprint (Fingerprint): The identity of the content, a coroutine function
+                                       computing it, or None to never collapse.
+            upload (Callable[[], Awaitable[None]]): Writes the file when this call leads.
+
+        Raises:
+            UploadConflictError: If another writer holds the filename in REJECT mode.
+        """
+        async with self.claimed(filename, fingerprint) as claim:
+            if claim.leader:
+                await upload()
+            else:
+                await claim.wait()
+
+    @asynccontextmanager
+    async def claimed(self, filename: str, fingerprint: Fingerprint = None) -> AsyncIterator[UploadClaim]:
+        """
+        Holds a claim for the duration of the context, releasing it with the context's
+        error, if any.
+        """
+        claim = await self.claim(filename, fingerprint)
+        try:
+            yield claim
+        except BaseException as exception:
+            claim.release(exception)
+            raise
+        else:
+            claim.release()
+
+    def stats(self) -> dict:
+        """
+        Returns the contention counters, the number of filenames currently held and the
+        number of flights that can still be joined.
+        """
+        return {**self.counters, "active_filenames": len(self._holders), "active_flights": len(self._latest)}
+
+    def _release(self, filename: str, flight: _Flight, locked: bool = True) -> None:
+        if self._latest.get(filename) is flight:
+            del self._latest[filename]
+        if locked:
+            self._locks[filename].release()
+        self._holders[filename] -= 1
+        if self._holders[filename] == 0:
+            # Nobody holds or waits for this filename any more; forget its lock.
+            del self._holders[filename]
+            del self._locks[filename]
@@ -14,16 +14,22 @@ Example Use Case:
     - Uploading a file to a local or remote storage system while notifying clients
       of the upload progress via WebSocket or other channels.
 """
+import asyncio
+import logging
 
-from domain.service import FileService
-from typing import TYPE_CHECKING, TypeVar
+from application.upload_coordinator import UploadClaim, UploadCoordinator
+from domain.service import FileService, UploadStream
+from typing import TYPE_CHECKING, Optional, TypeVar
 
 if TYPE_CHECKING:
     from domain.entity import FileEntity
 
+logger = logging.getLogger(__name__)
+
 # Define a type variable for flexibility with different types of repositories and notifiers.
 T = TypeVar('T', bound='FileRepository')
 N = TypeVar('N', bound='ProgressNotifier')
+D = TypeVar('D', bound='DurabilityPolicy')
 
 
 class UploadUseCase:
@@ -36,30 +42,144 @@ class UploadUseCase:
     The class serves as an entry point for the file upload process and uses
     the FileService to perform the actual file upload operation.
 
+    Concurrent uploads of the same filename go through an UploadCoordinator, which lets
+    only one of them write at a time and collapses identical ones into a single write.
+
     Attributes:
         file_service (FileService): A service that handles the file upload process
                                     and progress notifications.
+        coordinator (UploadCoordinator): Coordinates concurrent uploads of the same filename.
     """
 
-    def __init__(self, file_repo: T, progress_notifier: N) -> None:
+    def __init__(self, file_repo: T, progress_notifier: N, durability: Optional[D] = None,
+                 coordinator: Optional[UploadCoordinator] = None) -> None:
         """
         Initialize the UploadUseCase with the necessary dependencies.
 
         Args:
             file_repo: The file repository instance that handles file storage (e.g., local or S3 storage).
             progress_notifier: The progress notifier instance that communicates upload progress (e.g., via WebSocket).
+            durability: The policy that makes completed uploads durable before they are acknowledged, if any.
+            coordinator: Coordinates concurrent uploads of the same filename; a default one is created if omitted.
         """
-        self.file_service = FileService(file_repo, progress_notifier)
+        self.file_service = FileService(file_repo, progress_notifier, durability)
+        self.coordinator = coordinator or UploadCoordinator()
 
     async def execute(self, file_entity: 'FileEntity'):
         """
         Execute the file upload use case by delegating the file upload process
         to the FileService. This method is responsible for handling the
         business logic of uploading a file and ensuring that the upload
-        progress is properly notified.
+        progress is properly notified. The content is only fingerprinted if the
+        filename is already being uploaded, as only then can the upload be collapsed.
 
         Args:
             file_entity (FileEntity): The file entity containing the file's metadata and content
                                       that needs to be uploaded.
+
+        Raises:
+            UploadConflictError: If the filename is being uploaded and conflicts are rejected.
+        """
+        await self.coordinator.run(
+            file_entity.filename,
+            lambda: self.coordinator.fingerprint(file_entity.content),
+            lambda: self.file_service.upload_file(file_entity),
+        )
+
+    async def open_stream(self, filename: str, total_size: Optional[int] = None) -> 'CoordinatedUploadStream':
         """
-        await self.file_service.upload_file(file_entity)
\ No newline at end of file
+        Open a streaming upload, for file content that arrives incrementally and is
+        written to the repository as it is received. Waits until no other upload of
+        the filename is being written.
+
+        Args:
+            filename (str): The name of the file to upload.
+            total_size (Optional[int]): The final size of the file, if known in advance.
+
+        Returns:
+            CoordinatedUploadStream: The stream to write the file content to, in order.
+
+        Raises:
+            UploadConflictError: If the filename is being uploaded and conflicts are rejected.
+        """
+        claim = await self.coordinator.claim(filename, self.coordinator.stream_fingerprint(total_size))
+        return CoordinatedUploadStream(self.file_service.open_stream(filename, total_size), claim)
+
+
+class CoordinatedUploadStream:
+    """
+    CoordinatedUploadStream is an UploadStream written under an UploadClaim. When the
+    claim joined an identical upload already in flight, the content is discarded as it
+    arrives and finishing waits for that upload instead.
+
+    Writing, finishing and aborting never overlap, and an aborted stream only releases
+    its claim once the partial upload has been discarded, so the next writer of the
+    filename never races with it.
+
+    Attributes:
+        stream (UploadStream): The underlying stream to the file repository.
+        claim (UploadClaim): The claim the stream is written under.
+    """
+
+    def __init__(self, stream: UploadStream, claim: UploadClaim) -> None:
+        self.stream = stream
+        self.claim = claim
+        self._lock = asyncio.Lock()
+        self._done = False
+
+    async def write(self, data: bytes) -> None:
+        """
+        Writes the next piece of the file, unless another upload is writing it or the
+        stream has ended.
+        """
+        async with self._lock:
+            if self.claim.leader and not self._done:
+                await self.stream.write(data)
+
+    async def finish(self) -> int:
+        """
+        Completes the upload, or waits for the identical upload it joined.
+
+        Returns:
+            int: The size of the uploaded file.
+        """
+        if not self.claim.leader:
+            await self.claim.wait()
+            return self.stream.total_size
+
+        async with self._lock:
+            self._done = True
+            try:
+                size = await self.stream.finish()
+            except BaseException as exception:
+                self.claim.release(exception)
+                raise
+            self.claim.release()
+            return size
+
+    def abort(self, error: BaseException) -> Optional[asyncio.Task]:
+        """
+        Abandons the upload, e.g. when the client disconnects or a write fails: once any
+        write in progress ends, the partial upload is discarded and the claim released
+        so the next writer of the filename can proceed. Does nothing once the stream
+        has finished or been aborted.
+
+        Args:
+            error (BaseException): Why the upload was abandoned.
+
+        Returns:
+            Optional[asyncio.Task]: The task discarding the upload, if one was started.
+        """
+        if self._done or not self.claim.leader:
+            return None
+        self._done = True
+        return asyncio.ensure_future(self._abort(error))
+
+    async def _abort(self, error: BaseException) -> None:
+        async with self._lock:
+            try:
+                await self.stream.abort()
+            except Exception:
+                logger.exception("Failed to discard the aborted upload of '%s'", self.stream.filename)
+            finally:
+                self.claim.release(error)
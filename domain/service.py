@@ -13,13 +13,14 @@ Example Use Case:
     - Uploading a large file in smaller chunks to prevent memory overload,
       while keeping the user informed of the progress.
 """
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 from infrastructure.settings import settings
 
 _F = TypeVar('_F', bound='FileEntity')
 _T = TypeVar('_T', bound='FileRepository')
 _N = TypeVar('_N', bound='ProgressNotifier')
+_D = TypeVar('_D', bound='DurabilityPolicy')
 
 
 class FileService:
@@ -35,26 +36,33 @@ class FileService:
         UPLOAD_RANGE (int): The number of chunks to divide the file into during upload.
         file_repo: The file repository instance that handles file storage operations.
         progress_notifier: The progress notifier instance that communicates upload progress.
+        durability: The policy that makes completed uploads durable, if any.
     """
 
     UPLOAD_RANGE = settings.NUMBER_UPLOAD_CHUNK  # The number of chunks to divide the file into during upload.
 
-    def __init__(self, file_repo: _T, progress_notifier: _N):
+    def __init__(self, file_repo: _T, progress_notifier: _N, durability: Optional[_D] = None):
         """
         Initialize the FileService with the necessary dependencies.
 
         Args:
             file_repo(_T): The file repository instance that will handle file storage.
             progress_notifier(_N): The progress notifier instance to notify upload progress.
+            durability(Optional[_D]): The policy that makes completed uploads durable
+                                      before they are acknowledged, if any.
         """
         self.file_repo = file_repo
         self.progress_notifier = progress_notifier
+        self.durability = durability
 
     async def upload_file(self, file_entity: _F) -> None:
         """
         Uploads a file in chunks to the file repository. This method divides the
         file content into smaller chunks, saves each chunk using the repository,
-        and notifies the progress notifier after each chunk is uploaded.
+        and notifies the progress notifier after each chunk is uploaded. The new
+        version replaces the stored file only once every chunk is saved and synced as
+        the durability policy requires, and is discarded if saving fails. It returns
+        once the upload is as durable as the durability policy requires.
 
         Args:
             file_entity (_F): The file entity containing the file's metadata and content
@@ -68,10 +76,56 @@ class FileService:
         chunk_size = total_size // self.UPLOAD_RANGE
         uploaded_size = 0
 
-        for i in range(self.UPLOAD_RANGE):
-            uploaded_size += await self._upload_chunk(
-                file_entity, uploaded_size, chunk_size, i
-                )
+        try:
+            for i in range(self.UPLOAD_RANGE):
+                if i == self.UPLOAD_RANGE - 1:
+                    # The last chunk also carries the remainder of the integer division.
+                    chunk_size = total_size - uploaded_size
+                uploaded_size = await self._upload_chunk(
+                    file_entity, uploaded_size, chunk_size, i
+                    )
+            await self.prepare(file_entity.filename)
+            await self.file_repo.publish(file_entity.filename)
+        except BaseException:
+            await self.file_repo.discard(file_entity.filename)
+            raise
+
+        await self.commit(file_entity.filename)
+
+    async def prepare(self, filename: str) -> None:
+        """
+        Waits until a completed upload's unpublished version is as durable as the
+        durability policy requires, before it is published.
+
+        Args:
+            filename (str): The name of the file whose upload is about to be published.
+        """
+        if self.durability is not None:
+            await self.durability.prepare(filename)
+
+    async def commit(self, filename: str) -> None:
+        """
+        Waits until a completed upload is as durable as the durability policy requires.
+
+        Args:
+            filename (str): The name of the file whose upload has completed.
+        """
+        if self.durability is not None:
+            await self.durability.commit(filename)
+
+    def open_stream(self, filename: str, total_size: Optional[int] = None) -> 'UploadStream':
+        """
+        Opens a streaming upload, for content that arrives incrementally (e.g. a raw
+        request body) instead of being held in memory as a whole.
+
+        Args:
+            filename (str): The name of the file to write.
+            total_size (Optional[int]): The final size of the file, if known in advance.
+
+        Returns:
+            UploadStream: The stream to write the content to, in order.
+        """
+        return UploadStream(self, filename, total_size)
 
     async def _upload_chunk(self, file_entity: _F,
                             uploaded_size: int, chunk_size: int,
@@ -97,3 +151,85 @@ class FileService:
         # Notify progress via notifier adapter.
         self.progress_notifier.notify_progress(f"{(chunk_index + 1) * self.UPLOAD_RANGE}%")
         return uploaded_size
+
+
+class UploadStream:
+    """
+    UploadStream writes a file whose content arrives in pieces, appending every piece
+    to the file repository as soon as it is received and notifying progress when the
+    total size is known. The stored file is only replaced when the stream finishes;
+    an aborted stream leaves it as it was.
+
+    Attributes:
+        filename (str): The name of the file being written.
+        total_size (Optional[int]): The final size of the file, if known in advance.
+        written (int): The number of bytes written so far.
+    """
+
+    def __init__(self, file_service: FileService, filename: str, total_size: Optional[int] = None):
+        """
+        Initialize the UploadStream.
+
+        Args:
+            file_service (FileService): The service whose repository and notifier are used.
+            filename (str): The name of the file being written.
+            total_size (Optional[int]): The final size of the file, if known in advance.
+        """
+        self.file_service = file_service
+        self.filename = filename
+        self.total_size = total_size
+        self.written = 0
+        self._notified_step = 0
+
+    async def write(self, data: bytes) -> None:
+        """
+        Appends the next piece of the file to the repository.
+
+        Args:
+            data (bytes): The next piece of file content.
+        """
+        await self.file_service.file_repo.append_chunk(self.filename, self.written, data, self.total_size)
+        self.written += len(data)
+
+        if self.total_size:
+            # Notify once per 1/UPLOAD_RANGE of the file, as upload_file does.
+            step = min(self.written * self.file_service.UPLOAD_RANGE // self.total_size,
+                       self.file_service.UPLOAD_RANGE)
+            if step > self._notified_step:
+                self._notify(step)
+
+    async def finish(self) -> int:
+        """
+        Completes the upload, creating an empty file if no content was written, makes
+        it replace the stored file once its data is synced, and waits until it is as
+        durable as the durability policy requires.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        file_repo = self.file_service.file_repo
+        try:
+            if self.written == 0:
+                await file_repo.append_chunk(self.filename, 0, b"", self.total_size)
+            await self.file_service.prepare(self.filename)
+            await file_repo.publish(self.filename)
+        except BaseException:
+            await file_repo.discard(self.filename)
+            raise
+
+        await self.file_service.commit(self.filename)
+
+        if self._notified_step < self.file_service.UPLOAD_RANGE:
+            self._notify(self.file_service.UPLOAD_RANGE)
+
+        return self.written
+
+    async def abort(self) -> None:
+        """
+        Abandons the upload, discarding what was written so far.
+        """
+        await self.file_service.file_repo.discard(self.filename)
+
+    def _notify(self, step: int) -> None:
+        self._notified_step = step
+        self.file_service.progress_notifier.notify_progress(f"{step * 100 // self.file_service.UPLOAD_RANGE}%")
@@ -9,11 +9,25 @@ contract for file storage functionality.
 The repository uses TortoiseORM with an asynchronous setup to handle database
 operations efficiently.
 
+Uploads are written as a sequence of `file_chunks` rows of bounded size rather than
+by rewriting a single growing blob, so each chunk costs one insert however large the
+file gets. The rows belong to an upload id that the `files` row only points to once
+the upload is published, in the same transaction that deletes the previous version's
+rows; an abandoned upload's rows are deleted by `discard`.
+
+On SQLite the connection runs in WAL mode with `synchronous=NORMAL`, so individual
+chunk commits are not fsynced; `sync` checkpoints the WAL to make completed uploads
+durable once, as the durability policy requires.
+
 Usage:
     To use this repository, instantiate the SQLAlchemyFile class and
     call its methods to save or retrieve file chunks.
 """
-from typing import TYPE_CHECKING, Union
+import uuid
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+from tortoise import connections
+from tortoise.transactions import in_transaction
 
 from application.interfaces.file_repository import FileRepository
 from domain.entity import FileEntity
@@ -21,22 +35,79 @@ from domain.entity import FileEntity
 if TYPE_CHECKING:
     from infrastructure.models.file_model import FileModel
 
+CHUNK_ROW_SIZE = 1024 * 1024  # Bytes buffered before they are inserted as one `file_chunks` row.
+
+# Chunk rows of uploads that were never published, e.g. because the process crashed.
+_ORPHAN_CHUNKS_SQL = (
+    'DELETE FROM "file_chunks" WHERE "upload" NOT IN '
+    '(SELECT "upload" FROM "files" WHERE "upload" IS NOT NULL)'
+)
 
 _FileEntity = Union[FileEntity, None]
 
+
+class _StagedUpload:
+    """
+    The unpublished version of a file being written: its upload id, the number of
+    chunk rows inserted so far, and the bytes not yet inserted.
+    """
+
+    def __init__(self) -> None:
+        self.upload = uuid.uuid4().hex
+        self.seq = 0
+        self.buffer = bytearray()
+
+
 class DBFile(FileRepository):
     """
     DBFile is an implementation of the FileRepository
     interface that utilizes Tortoise ORM to persist file data in a SQLite database asynchronously.
 
     Attributes:
-        None: Uses Tortoise ORM for database interactions.
+        connection_name (str): The Tortoise connection every query is routed to.
+        chunk_row_size (int): Bytes buffered before they are inserted as one chunk row.
     """
 
+    def __init__(self, connection_name: str = "default", chunk_row_size: int = CHUNK_ROW_SIZE) -> None:
+        """
+        Initialize the DBFile.
+
+        Args:
+            connection_name (str): The Tortoise connection every query is routed to.
+            chunk_row_size (int): Bytes buffered before they are inserted as one chunk row.
+        """
+        self.connection_name = connection_name
+        self.chunk_row_size = chunk_row_size
+        self._staged: Dict[str, _StagedUpload] = {}
+
+    async def open(self) -> None:
+        """
+        Prepares the connection before the first upload; `Lifecycle.startup` awaits it
+        before the instance is marked ready. On SQLite, per-commit fsync is relaxed; WAL
+        mode with `synchronous=NORMAL` stays crash-consistent, and `sync` provides
+        durability when it is asked for. It also deletes the chunk rows of uploads a
+        previous run never published, which is only safe while no upload is running and
+        assumes this process is the database's only writer.
+
+        Raises:
+            Exception: If the connection cannot be prepared.
+        """
+        connection = self._connection()
+        if connection.capabilities.dialect == "sqlite":
+            await connection.execute_script("PRAGMA synchronous=NORMAL")
+        await connection.execute_script(_ORPHAN_CHUNKS_SQL)
+
+    def _connection(self):
+        """
+        Returns the Tortoise connection queries are routed to.
+        """
+        return connections.get(self.connection_name)
+
     async def save_file_chunk(self, file_entity: FileEntity, offset: int, chunk_size: int) -> None:
         """
-        Saves a chunk of a file to the database. If a file with the same filename
-        already exists, this method appends the new chunk to the existing content.
+        Saves a chunk of a file to the database. A chunk at offset 0 starts a new
+        version of the file; later chunks are appended to it. The version replaces the
+        stored file on `publish`.
 
         Args:
             file_entity (FileEntity): The entity representing the file to be saved.
@@ -46,27 +117,131 @@ class DBFile(FileRepository):
         Raises:
             Exception: If there is an error while saving the file chunk to the database.
         """
-        from infrastructure.models.file_model import FileModel
+        data = memoryview(file_entity.content)[offset:offset + chunk_size]
+        await self.append_chunk(file_entity.filename, offset, data, len(file_entity.content))
+
+    async def append_chunk(self, filename: str, position: int, data: bytes, total_size: Optional[int] = None) -> None:
+        """
+        Writes a chunk of streamed data to the database. A chunk at position 0 starts a
+        new version of the file; later chunks are appended to it. Data is inserted in
+        rows of `chunk_row_size` bytes, so at most one row is buffered per upload.
 
-        file_record = await FileModel.get_or_none(filename=file_entity.filename)
+        Args:
+            filename (str): The name of the file being written.
+            position (int): The byte position in the file at which `data` starts.
+            data (bytes): The chunk of file content.
+            total_size (Optional[int]): The final size of the file, if known. Unused.
+
+        Raises:
+            Exception: If there is an error while saving the chunk to the database.
+        """
+        if position == 0 or filename not in self._staged:
+            await self.discard(filename)
+            self._staged[filename] = _StagedUpload()
 
-        if file_record:
+        staged = self._staged[filename]
+        staged.buffer += data
+        if len(staged.buffer) >= self.chunk_row_size:
+            await self._flush(staged)
 
-            existing_content = file_record.content
-            updated_content = existing_content + file_entity.content[offset:offset + chunk_size]
-            file_record.content = updated_content
-        else:
+    async def publish(self, filename: str) -> None:
+        """
+        Makes the new version of a file the stored one: in one transaction, points the
+        `files` row at the new upload's chunk rows and deletes the previous version.
 
-            file_record = FileModel(
-                filename=file_entity.filename,
-                content=file_entity.content[offset:offset + chunk_size]
-            )
+        Args:
+            filename (str): The name of the file whose new version is complete.
 
-        await file_record.save()
+        Raises:
+            Exception: If there is an error while saving the file to the database.
+        """
+        from infrastructure.models.file_model import FileChunkModel, FileModel
+
+        staged = self._staged.get(filename)
+        if staged is None:
+            return
+        await self._flush(staged)
+
+        async with in_transaction(self.connection_name) as connection:
+            file_record = await FileModel.get_or_none(filename=filename, using_db=connection)
+            previous = None
+
+            if file_record:
+                previous = file_record.upload
+            else:
+                file_record = FileModel(filename=filename)
+
+            file_record.content = None
+            file_record.upload = staged.upload
+            await file_record.save(using_db=connection)
+
+            if previous is not None:
+                await FileChunkModel.filter(upload=previous).using_db(connection).delete()
+
+        del self._staged[filename]
+
+    async def discard(self, filename: str) -> None:
+        """
+        Deletes the chunk rows of a file's unpublished version, if any.
+
+        Args:
+            filename (str): The name of the file whose new version is abandoned.
+
+        Raises:
+            Exception: If there is an error while deleting the rows.
+        """
+        from infrastructure.models.file_model import FileChunkModel
+
+        staged = self._staged.pop(filename, None)
+        if staged is not None and staged.seq > 0:
+            connection = self._connection()
+            await FileChunkModel.filter(upload=staged.upload).using_db(connection).delete()
+
+    async def _flush(self, staged: _StagedUpload) -> None:
+        """
+        Inserts the buffered bytes of an upload as its next chunk row.
+        """
+        from infrastructure.models.file_model import FileChunkModel
+
+        if not staged.buffer:
+            return
+
+        connection = self._connection()
+        await FileChunkModel.create(upload=staged.upload, seq=staged.seq, data=bytes(staged.buffer),
+                                    using_db=connection)
+        staged.seq += 1
+        staged.buffer.clear()
+
+    async def sync_staged(self, filenames: List[str]) -> None:
+        """
+        Does nothing: the chunk rows are committed before the transaction that
+        publishes them, and the database never keeps a later commit without the
+        earlier ones, so a published upload cannot lose its data in a crash.
+
+        Args:
+            filenames (List[str]): The names of the files about to be published.
+        """
+
+    async def sync(self, filenames: List[str]) -> None:
+        """
+        Makes all committed uploads durable. On SQLite this checkpoints the WAL, which
+        fsyncs it and the database file; other databases already sync on commit.
+
+        Args:
+            filenames (List[str]): The names of the files to make durable. A checkpoint
+                                   covers every committed file, so they are not used.
+
+        Raises:
+            Exception: If the checkpoint fails.
+        """
+        connection = self._connection()
+        if connection.capabilities.dialect == "sqlite":
+            await connection.execute_query("PRAGMA wal_checkpoint(FULL)")
 
     async def get_file(self, filename: str) -> _FileEntity:
         """
-        Retrieves a file from the database by its filename.
+        Retrieves a file from the database by its filename, joining its chunk rows
+        in a single transaction so a concurrent publish cannot be observed halfway.
 
         Args:
             filename (str): The name of the file to retrieve.
@@ -77,11 +252,18 @@ class DBFile(FileRepository):
         Raises:
             Exception: If there is an error while retrieving the file from the database.
         """
-        from infrastructure.models.file_model import FileModel
+        from infrastructure.models.file_model import FileChunkModel, FileModel
+
+        async with in_transaction(self.connection_name) as connection:
+            file_record = await FileModel.get_or_none(filename=filename, using_db=connection)
 
-        file_record = await FileModel.get_or_none(filename=filename)
+            if file_record is None:
+                return None
 
-        if file_record:
-            return FileEntity(filename=file_record.filename, content=file_record.content)
+            content = file_record.content
+            if file_record.upload is not None:
+                chunks = await FileChunkModel.filter(upload=file_record.upload).using_db(connection) \
+                    .order_by("seq").values_list("data", flat=True)
+                content = b"".join(chunks)
 
-        return None
+        return FileEntity(filename=file_record.filename, content=content)
@@ -6,6 +6,13 @@ This module defines the `FileRepository` class, which implements the
 The `FileRepository` is responsible for saving file chunks to a specified upload
 directory and ensuring that the directory exists before performing any file operations.
 
+Files are not stored under their client-supplied names. Each logical filename is
+hashed and stored in nested hash-prefix directories (e.g. `uploads/3f/a2/3fa2...`), so
+no single directory grows unbounded and unsafe names cannot escape the upload
+directory. A `NameIndex` maps each logical filename to its stored path. An upload is
+written next to the stored path with a `.part` suffix and renamed over it on publish,
+so the previous version stays intact until the new one is complete.
+
 This implementation follows the interfaces and adapters architecture, allowing the
 application to interact with the file system through an abstract interface.
 
@@ -14,12 +21,121 @@ Example Use Case:
       future adaptation to different storage mechanisms (e.g., cloud storage).
 """
 
+import asyncio
+import hashlib
 import os
+import sqlite3
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 from application.interfaces.file_repository import FileRepository
 from domain.entity import FileEntity
 
 UPLOAD_DIR = "uploads"  # Directory where uploaded files will be stored.
+INDEX_FILENAME = ".index.sqlite3"  # Name index kept inside the upload directory.
+SHARD_DEPTH = 2  # Number of nested hash-prefix directories.
+SHARD_WIDTH = 2  # Hex characters per hash-prefix directory (256 entries per level).
+PARTIAL_SUFFIX = ".part"  # Suffix of a file version that has not been published yet.
+
+_FileEntity = Union[FileEntity, None]
+
+
+class ShardedLayout:
+    """
+    ShardedLayout maps a logical filename to a stored path made of hash-prefix
+    directories followed by the full hash of the name.
+
+    Attributes:
+        depth (int): The number of nested hash-prefix directories.
+        width (int): The number of hex characters in each directory name.
+    """
+
+    def __init__(self, depth: int = SHARD_DEPTH, width: int = SHARD_WIDTH) -> None:
+        """
+        Initialize the layout.
+
+        Args:
+            depth (int): The number of nested hash-prefix directories.
+            width (int): The number of hex characters in each directory name.
+        """
+        self.depth = depth
+        self.width = width
+
+    def stored_path(self, filename: str) -> str:
+        """
+        Returns the path, relative to the upload directory, at which a file is stored.
+
+        Args:
+            filename (str): The logical (client-supplied) filename.
+
+        Returns:
+            str: The relative stored path, e.g. `3f/a2/3fa2...`.
+        """
+        digest = hashlib.sha256(filename.encode("utf-8")).hexdigest()
+        prefixes = [digest[i * self.width:(i + 1) * self.width] for i in range(self.depth)]
+        return os.path.join(*prefixes, digest)
+
+
+class NameIndex:
+    """
+    NameIndex is a persistent mapping from logical filenames to stored paths, kept in a
+    SQLite database inside the upload directory.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open (and create if needed) the index database.
+
+        Args:
+            path (str): The path of the SQLite database file.
+        """
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS names (filename TEXT PRIMARY KEY, path TEXT NOT NULL)")
+        self._conn.commit()
+        # Checkpoints run in the worker thread of `File.sync`, concurrently with writes on
+        # the loop thread, so they get a connection of their own.
+        self._checkpoint_conn = sqlite3.connect(path, check_same_thread=False)
+
+    def get(self, filename: str) -> Optional[str]:
+        """
+        Returns the stored path of a logical filename, or None if it is unknown.
+        """
+        row = self._conn.execute("SELECT path FROM names WHERE filename = ?", (filename,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, filename: str, path: str) -> None:
+        """
+        Records (or replaces) the stored path of a logical filename.
+        """
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO names (filename, path) VALUES (?, ?)", (filename, path))
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """
+        Iterates over all (filename, stored path) pairs.
+        """
+        return iter(self._conn.execute("SELECT filename, path FROM names").fetchall())
+
+    def checkpoint(self) -> None:
+        """
+        Checkpoints the WAL, making every recorded name durable. Waits, up to the
+        connection's busy timeout, for a write in progress to commit.
+
+        Raises:
+            sqlite3.OperationalError: If the checkpoint could not complete.
+        """
+        busy, _, _ = self._checkpoint_conn.execute("PRAGMA wal_checkpoint(FULL)").fetchone()
+        if busy:
+            raise sqlite3.OperationalError("Name index checkpoint did not complete")
+
+    def close(self) -> None:
+        """
+        Closes the underlying database connections.
+        """
+        self._checkpoint_conn.close()
+        self._conn.close()
+
 
 class File(FileRepository):
     """
@@ -29,26 +145,42 @@ class File(FileRepository):
     is created if it does not exist.
 
     Attributes:
-        None
+        upload_dir (str): The root directory of the sharded layout.
+        layout (ShardedLayout): The layout used to place newly stored files.
+        index (NameIndex): The index of logical filenames to stored paths.
     """
 
-    def __init__(self):
+    def __init__(self, upload_dir: str = UPLOAD_DIR, layout: Optional[ShardedLayout] = None):
         """
         Initialize the FileRepository and create the upload directory if it doesn't exist.
 
         This constructor checks for the existence of the designated upload directory
         and creates it if it is not present, ensuring that file operations can proceed
-        without errors related to missing directories.
+        without errors related to missing directories. It then opens the name index.
+
+        Args:
+            upload_dir (str): The root directory of the sharded layout.
+            layout (Optional[ShardedLayout]): The layout for new files; defaults to
+                                              `SHARD_DEPTH` levels of `SHARD_WIDTH` characters.
         """
-        if not os.path.exists(UPLOAD_DIR):
-            os.makedirs(UPLOAD_DIR)
+        self.upload_dir = upload_dir
+        self.layout = layout or ShardedLayout()
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self.index = NameIndex(os.path.join(self.upload_dir, INDEX_FILENAME))
+        self._known_dirs = set()
+        self._unsynced_dirs: Set[str] = set()
+        # Stored path and open partial version of each file being uploaded.
+        self._staged: Dict[str, Tuple[str, BinaryIO]] = {}
 
-    def save_file_chunk(self, file_entity: FileEntity, offset: int, chunk_size: int):
+    async def save_file_chunk(self, file_entity: FileEntity, offset: int, chunk_size: int):
         """
         Save a chunk of the file to the local file system.
 
-        This method appends a specific chunk of the file content, defined by the
-        offset and chunk size, to the designated file in the upload directory.
+        This method writes a specific chunk of the file content, defined by the
+        offset and chunk size, to the partial version of the file next to its stored
+        path in the upload directory, assigning and indexing a stored path the first
+        time a filename is seen. A chunk at offset 0 starts a new partial version;
+        later chunks are appended to it.
 
         Args:
             file_entity (FileEntity): The file entity containing the file's metadata
@@ -60,6 +192,166 @@ class File(FileRepository):
         Raises:
             IOError: If there is an error during the file writing process.
         """
-        file_path = os.path.join(UPLOAD_DIR, file_entity.filename)
-        with open(file_path, 'ab') as f:  # Open the file in append-binary mode.
-            f.write(file_entity.content[offset:offset + chunk_size])
+        data = memoryview(file_entity.content)[offset:offset + chunk_size]
+        await self.append_chunk(file_entity.filename, offset, data, len(file_entity.content))
+
+    async def append_chunk(self, filename: str, position: int, data: bytes, total_size: Optional[int] = None):
+        """
+        Write a chunk of streamed data to the local file system. A chunk at position 0
+        resolves the stored path and opens a new partial version of the file; later
+        chunks are appended through the same handle until it is published or discarded.
+
+        Args:
+            filename (str): The name of the file being written.
+            position (int): The byte position in the file at which `data` starts.
+            data (bytes): The chunk of file content.
+            total_size (Optional[int]): The final size of the file, if known. Unused.
+
+        Raises:
+            IOError: If there is an error during the file writing process.
+        """
+        staged = self._staged.get(filename)
+        if position == 0 or staged is None:
+            if staged is not None:
+                staged[1].close()
+            file_path = self._resolve(filename, create=True)
+            staged = (file_path, open(file_path + PARTIAL_SUFFIX, 'wb' if position == 0 else 'ab'))
+            self._staged[filename] = staged
+        staged[1].write(data)
+
+    async def publish(self, filename: str) -> None:
+        """
+        Renames the partial version of a file over its stored path.
+
+        Args:
+            filename (str): The name of the file whose new version is complete.
+
+        Raises:
+            OSError: If the partial version cannot be written out or renamed.
+        """
+        staged = self._staged.pop(filename, None)
+        if staged is not None:
+            file_path, f = staged
+            f.close()
+            os.replace(file_path + PARTIAL_SUFFIX, file_path)
+
+    async def discard(self, filename: str) -> None:
+        """
+        Deletes the partial version of a file, if any.
+
+        Args:
+            filename (str): The name of the file whose new version is abandoned.
+        """
+        staged = self._staged.pop(filename, None)
+        if staged is not None:
+            file_path, f = staged
+            try:
+                f.close()
+            finally:
+                try:
+                    os.remove(file_path + PARTIAL_SUFFIX)
+                except FileNotFoundError:
+                    pass
+
+    async def sync_staged(self, filenames: List[str]) -> None:
+        """
+        Fsyncs the partial versions of the given files in a worker thread, so that the
+        rename done by `publish` never exposes data a crash could lose.
+
+        Args:
+            filenames (List[str]): The names of the files about to be published.
+
+        Raises:
+            OSError: If a partial version cannot be written out or synced.
+        """
+        handles = [self._staged[name][1] for name in filenames if name in self._staged]
+        await asyncio.to_thread(self._fsync_staged, handles)
+
+    @staticmethod
+    def _fsync_staged(handles: List[BinaryIO]) -> None:
+        for f in handles:
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def sync(self, filenames: List[str]) -> None:
+        """
+        Fsyncs the stored files, their shard directories, the parents of shard
+        directories created since the last sync, and the name index, in a worker thread
+        so the event loop is not blocked.
+
+        Args:
+            filenames (List[str]): The names of the files to make durable.
+
+        Raises:
+            OSError: If a file or directory cannot be synced.
+        """
+        paths = [path for path in (self._resolve(name, create=False) for name in filenames) if path]
+        directories, self._unsynced_dirs = self._unsynced_dirs, set()
+        try:
+            await asyncio.to_thread(self._fsync, paths, directories)
+        except BaseException:
+            self._unsynced_dirs |= directories
+            raise
+
+    def _fsync(self, paths: List[str], directories: Iterable[str]) -> None:
+        for path in paths + sorted({os.path.dirname(path) for path in paths} | set(directories)):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self.index.checkpoint()
+
+    async def get_file(self, filename: str) -> _FileEntity:
+        """
+        Retrieves a file from the upload directory by its logical filename.
+
+        Args:
+            filename (str): The name of the file to retrieve.
+
+        Returns:
+            _FileEntity: Either an instance of FileEntity containing the file's name and content or None.
+        """
+        file_path = self._resolve(filename, create=False)
+
+        if file_path is None or not os.path.exists(file_path):
+            return None
+
+        with open(file_path, 'rb') as f:
+            return FileEntity(filename=filename, content=f.read())
+
+    async def close(self) -> None:
+        """
+        Closes the partial versions still open and the name index.
+        """
+        for _, f in self._staged.values():
+            f.close()
+        self._staged.clear()
+        self.index.close()
+
+    def _resolve(self, filename: str, create: bool) -> Optional[str]:
+        """
+        Returns the absolute stored path for a logical filename, optionally assigning
+        one (and creating its shard directories) if the name is not yet indexed.
+        """
+        stored = self.index.get(filename)
+
+        if stored is None:
+            if not create:
+                return None
+            stored = self.layout.stored_path(filename)
+            self.index.set(filename, stored)
+
+        file_path = os.path.join(self.upload_dir, stored)
+        shard_dir = os.path.dirname(file_path)
+        if create and shard_dir not in self._known_dirs:
+            os.makedirs(shard_dir, exist_ok=True)
+            self._known_dirs.add(shard_dir)
+            # The entries of the shard directories, from the upload directory down, are
+            # only durable once their parents are fsynced; see `sync`.
+            parts = os.path.relpath(shard_dir, self.upload_dir).split(os.sep)
+            self._unsynced_dirs.update(
+                os.path.join(self.upload_dir, *parts[:depth]) for depth in range(len(parts))
+            )
+
+        return file_path
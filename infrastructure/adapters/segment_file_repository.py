@@ -0,0 +1,617 @@
+"""
+Module: infrastructure.adapters.segment_file_repository
+
+This module implements the `SegmentFile` class, a log-structured implementation of the
+FileRepository interface intended for very large numbers of small files. Instead of
+creating one file (or one database row) per upload, file data is appended to large
+preallocated segment files, and an append-only index log maps every filename to the
+segment, offset and length of its latest version. The extent of a version still being
+written is only tracked in memory until it is published, so neither readers nor the
+index log ever see it half-written.
+
+Reads are served as `memoryview` slices over a read-only `mmap` of the segment, so file
+content is never copied on the way out. Overwritten and deleted files leave dead bytes
+behind in their segment; a background compaction task copies the live files out of
+mostly-dead segments and deletes them to reclaim the space.
+
+Usage:
+    Instantiate `SegmentFile` with a directory and await `save_file_chunk` or
+    `append_chunk` followed by `publish`, `get_file` or `delete_file`. Call `close` on
+    shutdown to stop compaction and release the segment file descriptors and mappings.
+"""
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from application.interfaces.file_repository import FileRepository
+from domain.entity import FileEntity
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_DIR = "segments"  # Directory where segment files and the index log are stored.
+SEGMENT_SIZE = 64 * 1024 * 1024  # Bytes preallocated for each new segment.
+INDEX_FILENAME = "index.log"
+COMPACTION_INTERVAL = 60.0  # Seconds between background compaction passes.
+COMPACTION_GARBAGE_RATIO = 0.5  # Fraction of dead bytes that makes a sealed segment eligible.
+
+# Index record header: op, segment id, offset, length, capacity, filename length.
+_RECORD_HEADER = struct.Struct("<BIQQQH")
+_OP_PUT = 1
+_OP_DELETE = 2
+
+_FileEntity = Union[FileEntity, None]
+
+
+@dataclass(frozen=True)
+class Extent:
+    """
+    The location of a stored file inside a segment.
+
+    Attributes:
+        segment (int): The id of the segment holding the file.
+        offset (int): The byte offset of the file within the segment.
+        length (int): The number of bytes of the file written so far.
+        capacity (int): The number of bytes reserved for the file in the segment.
+    """
+
+    segment: int
+    offset: int
+    length: int
+    capacity: int
+
+
+class SegmentFile(FileRepository):
+    """
+    SegmentFile is an implementation of the FileRepository interface that packs files
+    into large append-only segment files and keeps an on-disk index of their locations.
+
+    The first chunk of an upload (offset 0) reserves space for the whole file at the tail
+    of the active segment, and every chunk is written into that reservation with a
+    positional write; streamed files of unknown size grow their reservation by doubling.
+    Writing sequentially into preallocated space keeps small-file throughput close to
+    the sequential bandwidth of the disk. The extent is staged until `publish` records it
+    in the index; `discard` turns it into garbage instead.
+
+    Attributes:
+        directory (str): The directory holding the segments and the index log.
+        segment_size (int): The number of bytes preallocated for each new segment.
+        compaction_interval (float): Seconds between compaction passes; 0 disables them.
+        garbage_ratio (float): The dead-byte fraction at which a sealed segment is compacted.
+    """
+
+    def __init__(self, directory: str = SEGMENT_DIR, segment_size: int = SEGMENT_SIZE,
+                 compaction_interval: float = COMPACTION_INTERVAL,
+                 garbage_ratio: float = COMPACTION_GARBAGE_RATIO) -> None:
+        """
+        Initialize the SegmentFile, creating the directory if needed and rebuilding the
+        in-memory index by replaying the index log.
+
+        Args:
+            directory (str): The directory holding the segments and the index log.
+            segment_size (int): The number of bytes preallocated for each new segment.
+            compaction_interval (float): Seconds between compaction passes; 0 disables them.
+            garbage_ratio (float): The dead-byte fraction at which a sealed segment is compacted.
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.compaction_interval = compaction_interval
+        self.garbage_ratio = garbage_ratio
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, Extent] = {}
+        self._staging: Dict[str, Extent] = {}
+        self._fds: Dict[int, int] = {}
+        self._sizes: Dict[int, int] = {}
+        self._tails: Dict[int, int] = {}
+        self._garbage: Dict[int, int] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._retired_maps: List[mmap.mmap] = []
+        self._compaction_lock = threading.Lock()
+        self._log_backlog: Optional[List[bytes]] = None
+        self._index_renamed = False
+        self._active: Optional[int] = None
+        self._compaction_task: Optional[asyncio.Task] = None
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    async def save_file_chunk(self, file_entity: FileEntity, offset: int, chunk_size: int) -> None:
+        """
+        Saves a chunk of a file into its reserved extent. A chunk at offset 0 starts a new
+        version of the file and reserves `len(file_entity.content)` bytes for it.
+
+        Args:
+            file_entity (FileEntity): The entity representing the file to be saved.
+            offset (int): The starting index from which to read the content chunk.
+            chunk_size (int): The size of the chunk to be saved.
+
+        Raises:
+            OSError: If there is an error writing the segment or the index log.
+        """
+        data = memoryview(file_entity.content)[offset:offset + chunk_size]
+        await self.append_chunk(file_entity.filename, offset, data, len(file_entity.content))
+
+    async def append_chunk(self, filename: str, position: int, data: bytes, total_size: Optional[int] = None) -> None:
+        """
+        Writes a chunk of streamed data into the file's extent. A chunk at position 0
+        starts a new version of the file, reserving `total_size` bytes when it is known,
+        but no more than one segment: the announced size comes from the client, and
+        reserving it all up front would let a request that never sends its body claim
+        disk space. When a chunk does not fit the reservation, the file is moved to a new
+        extent of at least twice the size so that it stays contiguous for mmap reads.
+
+        Args:
+            filename (str): The name of the file being written.
+            position (int): The byte position in the file at which `data` starts.
+            data (bytes): The chunk of file content.
+            total_size (Optional[int]): The final size of the file, if known in advance.
+
+        Raises:
+            OSError: If there is an error writing the segment or the index log.
+        """
+        self._ensure_compaction()
+        if position and not data:
+            return
+        end = position + len(data)
+
+        with self._lock:
+            extent = self._staging.get(filename)
+
+            if position == 0 or extent is None:
+                capacity = max(min(total_size or 0, self.segment_size), end)
+                segment, start = self._allocate(capacity)
+                if extent is not None:
+                    self._add_garbage(extent)
+                extent = Extent(segment, start, 0, capacity)
+            elif end > extent.capacity:
+                extent = self._grow(extent, max(2 * extent.capacity, end))
+
+            os.pwrite(self._fds[extent.segment], data, extent.offset + position)
+            self._staging[filename] = Extent(extent.segment, extent.offset, max(extent.length, end), extent.capacity)
+
+    async def publish(self, filename: str) -> None:
+        """
+        Records the staged version of a file in the index, making it the one readers
+        see; the previous version, if any, becomes garbage for compaction to reclaim.
+
+        Args:
+            filename (str): The name of the file whose new version is complete.
+
+        Raises:
+            OSError: If there is an error writing the index log.
+        """
+        with self._lock:
+            extent = self._staging.pop(filename, None)
+            if extent is None:
+                return
+            previous = self._index.get(filename)
+            if previous is not None:
+                self._add_garbage(previous)
+            self._index[filename] = extent
+            self._append_record(_OP_PUT, filename, extent)
+
+    async def discard(self, filename: str) -> None:
+        """
+        Drops the staged version of a file, leaving its reservation as garbage.
+
+        Args:
+            filename (str): The name of the file whose new version is abandoned.
+        """
+        with self._lock:
+            extent = self._staging.pop(filename, None)
+            if extent is not None:
+                self._add_garbage(extent)
+
+    async def sync_staged(self, filenames: List[str]) -> None:
+        """
+        Fsyncs the segments holding the staged versions of the given files, in a worker
+        thread, so that the index record `publish` appends never refers to data a crash
+        could lose.
+
+        Args:
+            filenames (List[str]): The names of the files about to be published.
+
+        Raises:
+            OSError: If a segment cannot be synced.
+        """
+        with self._lock:
+            segments = {self._staging[name].segment for name in filenames if name in self._staging}
+            fds = [os.dup(self._fds[segment]) for segment in segments]
+
+        await asyncio.to_thread(self._fsync_all, fds)
+
+    async def sync(self, filenames: List[str]) -> None:
+        """
+        Fsyncs the segments holding the given files and the index log, in a worker
+        thread so the event loop is not blocked. Files sharing a segment cost a single
+        fsync, which is what makes group commit cheap for this repository.
+
+        Args:
+            filenames (List[str]): The names of the files to make durable.
+
+        Raises:
+            OSError: If a segment or the index log cannot be synced.
+        """
+        with self._lock:
+            segments = {self._index[name].segment for name in filenames if name in self._index}
+            # Duplicate the descriptors so compaction may close the originals meanwhile.
+            fds = [os.dup(self._fds[segment]) for segment in segments]
+            fds.append(os.dup(self._index_file.fileno()))
+            if self._index_renamed:
+                # The index log was just replaced; its directory entry is not durable yet.
+                fds.append(os.open(self.directory, os.O_RDONLY))
+
+        await asyncio.to_thread(self._fsync_all, fds)
+
+    @staticmethod
+    def _fsync_all(fds: List[int]) -> None:
+        try:
+            for fd in fds:
+                os.fsync(fd)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    async def get_file(self, filename: str) -> _FileEntity:
+        """
+        Retrieves a file by its filename. The returned entity's content is a read-only
+        `memoryview` over the mapped segment rather than a copy of the data.
+
+        Args:
+            filename (str): The name of the file to retrieve.
+
+        Returns:
+            _FileEntity: Either an instance of FileEntity for the file or None.
+        """
+        view = self.read_view(filename)
+
+        if view is not None:
+            return FileEntity(filename=filename, content=view)
+
+        return None
+
+    def read_view(self, filename: str) -> Optional[memoryview]:
+        """
+        Returns a zero-copy view of a stored file's content.
+
+        Args:
+            filename (str): The name of the file to read.
+
+        Returns:
+            Optional[memoryview]: A read-only view of the file's bytes, or None if unknown.
+        """
+        with self._lock:
+            extent = self._index.get(filename)
+            if extent is None:
+                return None
+            mapping = self._map(extent.segment)
+            return memoryview(mapping)[extent.offset:extent.offset + extent.length]
+
+    async def delete_file(self, filename: str) -> bool:
+        """
+        Deletes a file from the index; its bytes are reclaimed by a later compaction.
+
+        Args:
+            filename (str): The name of the file to delete.
+
+        Returns:
+            bool: True if the file existed, False otherwise.
+        """
+        with self._lock:
+            extent = self._index.pop(filename, None)
+            if extent is None:
+                return False
+            self._add_garbage(extent)
+            self._append_record(_OP_DELETE, filename, extent)
+            return True
+
+    def compact(self) -> int:
+        """
+        Copies the live files out of every sealed segment whose dead-byte ratio has
+        reached `garbage_ratio`, then deletes those segments and rewrites the index. The
+        copies are fsynced before the index records them, so a crash never leaves the
+        index pointing at data that is not on disk.
+
+        The repository lock is only held to reserve space, swap index entries and
+        register or release segments; copying, fsyncing and writing the new index happen
+        outside it, so uploads keep flowing meanwhile. A file overwritten or deleted while
+        it is being copied keeps its new state. Segments holding a staged version are
+        skipped until it is published or discarded. This method performs blocking I/O
+        and is meant to run in a worker thread.
+
+        Returns:
+            int: The number of segments reclaimed.
+        """
+        with self._compaction_lock:
+            with self._lock:
+                self._prune_retired_maps()
+                staged = {extent.segment for extent in self._staging.values()}
+                candidates = {
+                    segment for segment in self._sizes
+                    if segment != self._active and segment not in staged
+                    and self._garbage.get(segment, 0) >= self.garbage_ratio * self._tails[segment]
+                }
+                live = [(name, extent) for name, extent in self._index.items() if extent.segment in candidates]
+                sources = {segment: self._map(segment) for segment in candidates}
+
+            if not candidates:
+                return 0
+
+            moves, destinations = [], set()
+            for name, extent in live:
+                with self._lock:
+                    segment, start = self._allocate(extent.capacity)
+                    fd = self._fds[segment]
+                with memoryview(sources[extent.segment])[extent.offset:extent.offset + extent.length] as data:
+                    os.pwrite(fd, data, start)
+                destinations.add(fd)
+                moves.append((name, extent, Extent(segment, start, extent.length, extent.capacity)))
+            sources.clear()
+
+            # Moved data must be on disk before the index log points at it.
+            for fd in destinations:
+                os.fsync(fd)
+
+            with self._lock:
+                for name, extent, moved in moves:
+                    if self._index.get(name) == extent:
+                        self._index[name] = moved
+                        self._append_record(_OP_PUT, name, moved)
+                    else:
+                        # Overwritten or deleted while it was being copied.
+                        self._add_garbage(moved)
+                index_fd = os.dup(self._index_file.fileno())
+
+            # ...and the index log must record the moves before the old copies are deleted.
+            self._fsync_all([index_fd])
+
+            with self._lock:
+                in_use = {extent.segment for extent in list(self._index.values()) + list(self._staging.values())}
+                reclaimed = [segment for segment in candidates if segment not in in_use]
+                for segment in reclaimed:
+                    self._release_segment(segment)
+
+            for segment in reclaimed:
+                os.remove(self._segment_path(segment))
+            if reclaimed:
+                self._rewrite_index()
+
+            return len(reclaimed)
+
+    async def close(self) -> None:
+        """
+        Stops background compaction, waiting for a pass in progress to finish, and
+        releases the index log, mappings and segment file descriptors.
+        """
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            self._compaction_task = None
+
+        await asyncio.to_thread(self._compaction_lock.acquire)
+        try:
+            with self._lock:
+                self._index_file.close()
+                for segment in list(self._sizes):
+                    self._release_segment(segment)
+                self._prune_retired_maps()
+        finally:
+            self._compaction_lock.release()
+
+    def _ensure_compaction(self) -> None:
+        """
+        Starts the background compaction task on the running loop the first time the
+        repository is written to.
+        """
+        if self._compaction_task is None and self.compaction_interval > 0:
+            self._compaction_task = asyncio.get_running_loop().create_task(self._compaction_loop())
+
+    async def _compaction_loop(self) -> None:
+        """
+        Periodically runs `compact` in a worker thread. A failed pass is logged and
+        retried at the next interval instead of stopping compaction for good.
+        """
+        while True:
+            await asyncio.sleep(self.compaction_interval)
+            try:
+                await asyncio.to_thread(self.compact)
+            except Exception:
+                logger.exception("Segment compaction failed")
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment:08d}.dat")
+
+    def _load(self) -> None:
+        """
+        Opens the existing segments and replays the index log to rebuild the in-memory
+        index and tail positions. A torn record at the end of the log, left by a crash
+        mid-append, is truncated away. Garbage is derived from the result rather than from
+        the replayed history, which `_rewrite_index` discards: whatever lies below a
+        segment's tail and is not reserved by a live file is dead.
+        """
+        for entry in sorted(os.listdir(self.directory)):
+            if entry.startswith("segment-") and entry.endswith(".dat"):
+                segment = int(entry[len("segment-"):-len(".dat")])
+                fd = os.open(self._segment_path(segment), os.O_RDWR)
+                self._register_segment(segment, fd, os.fstat(fd).st_size)
+
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        log = b""
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as f:
+                log = f.read()
+
+        position = 0
+        while position + _RECORD_HEADER.size <= len(log):
+            op, segment, offset, length, capacity, name_length = _RECORD_HEADER.unpack_from(log, position)
+            end = position + _RECORD_HEADER.size + name_length
+            if end > len(log):
+                break
+            name = log[position + _RECORD_HEADER.size:end].decode("utf-8")
+            position = end
+
+            if segment not in self._sizes:
+                continue
+
+            if op == _OP_PUT:
+                self._index[name] = Extent(segment, offset, length, capacity)
+                self._tails[segment] = max(self._tails[segment], offset + capacity)
+            elif op == _OP_DELETE:
+                self._index.pop(name, None)
+
+        if position != len(log):
+            with open(index_path, "r+b") as f:
+                f.truncate(position)
+
+        live = defaultdict(int)
+        for extent in self._index.values():
+            live[extent.segment] += extent.capacity
+        for segment, tail in self._tails.items():
+            self._garbage[segment] = tail - live[segment]
+
+        self._index_file = open(index_path, "ab", buffering=0)
+        if self._sizes:
+            self._active = max(self._sizes)
+
+    def _register_segment(self, segment: int, fd: int, size: int) -> None:
+        self._fds[segment] = fd
+        self._sizes[segment] = size
+        self._tails[segment] = 0
+        self._garbage[segment] = 0
+
+    def _create_segment(self, size: int) -> int:
+        """
+        Creates and preallocates a new segment, making it the active one.
+        """
+        segment = max(self._sizes, default=0) + 1
+        fd = os.open(self._segment_path(segment), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except (AttributeError, OSError):
+            os.ftruncate(fd, size)
+        self._register_segment(segment, fd, size)
+        self._active = segment
+        return segment
+
+    def _allocate(self, capacity: int) -> tuple:
+        """
+        Reserves `capacity` bytes at the tail of the active segment, rolling over to a
+        new segment when it does not fit. Must be called with the lock held.
+
+        Returns:
+            tuple: The segment id and offset of the reservation.
+        """
+        segment = self._active
+        if segment is None or self._tails[segment] + capacity > self._sizes[segment]:
+            segment = self._create_segment(max(self.segment_size, capacity))
+
+        start = self._tails[segment]
+        self._tails[segment] = start + capacity
+        return segment, start
+
+    def _grow(self, extent: Extent, capacity: int) -> Extent:
+        """
+        Copies a file's bytes into a new, larger reservation and marks the old one as
+        garbage. Must be called with the lock held.
+        """
+        data = self._map(extent.segment)[extent.offset:extent.offset + extent.length]
+        segment, start = self._allocate(capacity)
+        os.pwrite(self._fds[segment], data, start)
+        self._add_garbage(extent)
+        return Extent(segment, start, extent.length, capacity)
+
+    def _add_garbage(self, extent: Extent) -> None:
+        if extent.segment in self._garbage:
+            self._garbage[extent.segment] += extent.capacity
+
+    def _map(self, segment: int) -> mmap.mmap:
+        mapping = self._maps.get(segment)
+        if mapping is None:
+            mapping = mmap.mmap(self._fds[segment], self._sizes[segment], access=mmap.ACCESS_READ)
+            self._maps[segment] = mapping
+        return mapping
+
+    def _append_record(self, op: int, filename: str, extent: Extent) -> None:
+        record = _encode_record(op, filename, extent)
+        self._index_file.write(record)
+        if self._log_backlog is not None:
+            self._log_backlog.append(record)
+
+    def _rewrite_index(self) -> None:
+        """
+        Replaces the index log with one PUT record per live file, dropping the history
+        that replay would otherwise have to skip over.
+
+        The new log is written and fsynced without holding the lock. Records appended
+        to the old log meanwhile are collected in a backlog and copied over until none
+        are left, and only then, under the lock, is the new log swapped in.
+        """
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        tmp_path = index_path + ".tmp"
+
+        with self._lock:
+            snapshot = list(self._index.items())
+            self._log_backlog = []
+
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(b"".join(_encode_record(_OP_PUT, name, extent) for name, extent in snapshot))
+                while True:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    with self._lock:
+                        backlog, self._log_backlog = self._log_backlog, []
+                        if not backlog:
+                            self._index_file.close()
+                            os.replace(tmp_path, index_path)
+                            self._index_file = open(index_path, "ab", buffering=0)
+                            self._index_renamed = True
+                            break
+                    f.write(b"".join(backlog))
+        finally:
+            with self._lock:
+                self._log_backlog = None
+
+        directory_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
+        with self._lock:
+            self._index_renamed = False
+
+    def _release_segment(self, segment: int) -> None:
+        mapping = self._maps.pop(segment, None)
+        if mapping is not None:
+            try:
+                mapping.close()
+            except BufferError:
+                # Views handed out by read_view are still alive; keep the mapping until they go.
+                self._retired_maps.append(mapping)
+        os.close(self._fds.pop(segment))
+        del self._sizes[segment]
+        del self._tails[segment]
+        del self._garbage[segment]
+
+    def _prune_retired_maps(self) -> None:
+        """
+        Closes the mappings of released segments whose last view has gone, giving the
+        disk space of their deleted files back. Must be called with the lock held.
+        """
+        retired = []
+        for mapping in self._retired_maps:
+            try:
+                mapping.close()
+            except BufferError:
+                retired.append(mapping)
+        self._retired_maps = retired
+
+
+def _encode_record(op: int, filename: str, extent: Extent) -> bytes:
+    name = filename.encode("utf-8")
+    return _RECORD_HEADER.pack(op, extent.segment, extent.offset, extent.length, extent.capacity, len(name)) + name
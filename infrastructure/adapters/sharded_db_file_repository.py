@@ -0,0 +1,167 @@
+"""
+Module: infrastructure.adapters.sharded_db_file_repository
+
+This module implements the `ShardedDBFile` class, which spreads files across several
+SQLite databases so that uploads of different files no longer contend for a single
+database write lock. Each shard is its own Tortoise connection (`shard_0`, `shard_1`,
+...) holding a `files` table, and every file lives in exactly one shard chosen from a
+stable hash of its filename.
+
+Shards are chosen with jump consistent hashing, so changing the number of shards only
+moves the minimum share of files; `infrastructure.management.rebalance_shards` performs
+that move offline and creates the `files` table in new shards.
+
+Usage:
+    Set `STORAGE_BACKEND=sharded-db` and `DB_SHARDS`, initialise the shards with
+    `python -m infrastructure.management.rebalance_shards`, then start the server.
+"""
+import asyncio
+import hashlib
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+from application.interfaces.file_repository import FileRepository
+from domain.entity import FileEntity
+
+if TYPE_CHECKING:
+    from infrastructure.adapters.db_file_repository import DBFile
+
+_FileEntity = Union[FileEntity, None]
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Maps a 64-bit key to one of `buckets` buckets with Lamping and Veach's jump
+    consistent hash: growing from N to N+1 buckets moves only 1/(N+1) of the keys.
+    """
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+def shard_for(filename: str, shard_count: int) -> int:
+    """
+    Returns the shard that owns a filename.
+
+    Args:
+        filename (str): The name of the file.
+        shard_count (int): The number of shards.
+
+    Returns:
+        int: The index of the owning shard.
+    """
+    key = int.from_bytes(hashlib.blake2b(filename.encode("utf-8"), digest_size=8).digest(), "big")
+    return jump_hash(key, shard_count)
+
+
+class ShardedDBFile(FileRepository):
+    """
+    ShardedDBFile is an implementation of the FileRepository interface that routes
+    every operation to the `DBFile` of the shard owning the filename.
+
+    Attributes:
+        shards (List[DBFile]): One repository per shard connection, in shard order.
+    """
+
+    def __init__(self, shard_count: int) -> None:
+        """
+        Initialize the ShardedDBFile.
+
+        Args:
+            shard_count (int): The number of shards; connections `shard_0` to
+                               `shard_{shard_count - 1}` must be configured.
+        """
+        # Imported here so that `shard_for` can be used without the ORM installed.
+        from infrastructure.adapters.db_file_repository import DBFile
+
+        self.shards = [DBFile(f"shard_{shard}") for shard in range(shard_count)]
+
+    async def open(self) -> None:
+        """
+        Prepares every shard's connection before the first upload.
+
+        Raises:
+            Exception: If a shard cannot be prepared.
+        """
+        await asyncio.gather(*(shard.open() for shard in self.shards))
+
+    def _shard(self, filename: str) -> 'DBFile':
+        return self.shards[shard_for(filename, len(self.shards))]
+
+    async def save_file_chunk(self, file_entity: FileEntity, offset: int, chunk_size: int) -> None:
+        """
+        Saves a chunk of a file to the shard owning its filename.
+
+        Args:
+            file_entity (FileEntity): The entity representing the file to be saved.
+            offset (int): The starting index from which to read the content chunk.
+            chunk_size (int): The size of the chunk to be saved.
+        """
+        await self._shard(file_entity.filename).save_file_chunk(file_entity, offset, chunk_size)
+
+    async def append_chunk(self, filename: str, position: int, data: bytes, total_size: Optional[int] = None) -> None:
+        """
+        Writes a chunk of streamed data to the shard owning the filename.
+
+        Args:
+            filename (str): The name of the file being written.
+            position (int): The byte position in the file at which `data` starts.
+            data (bytes): The chunk of file content.
+            total_size (Optional[int]): The final size of the file, if known.
+        """
+        await self._shard(filename).append_chunk(filename, position, data, total_size)
+
+    async def publish(self, filename: str) -> None:
+        """
+        Publishes the new version of a file in the shard owning the filename.
+
+        Args:
+            filename (str): The name of the file whose new version is complete.
+        """
+        await self._shard(filename).publish(filename)
+
+    async def discard(self, filename: str) -> None:
+        """
+        Discards the unpublished version of a file in the shard owning the filename.
+
+        Args:
+            filename (str): The name of the file whose new version is abandoned.
+        """
+        await self._shard(filename).discard(filename)
+
+    async def sync_staged(self, filenames: List[str]) -> None:
+        """
+        Does nothing, as every shard orders chunk rows before their publish; see
+        `DBFile.sync_staged`.
+
+        Args:
+            filenames (List[str]): The names of the files about to be published.
+        """
+
+    async def sync(self, filenames: List[str]) -> None:
+        """
+        Makes the given files durable, syncing every shard involved once and in parallel.
+
+        Args:
+            filenames (List[str]): The names of the files to make durable.
+        """
+        by_shard: Dict[int, List[str]] = defaultdict(list)
+        for filename in filenames:
+            by_shard[shard_for(filename, len(self.shards))].append(filename)
+
+        await asyncio.gather(*(self.shards[shard].sync(names) for shard, names in by_shard.items()))
+
+    async def get_file(self, filename: str) -> _FileEntity:
+        """
+        Retrieves a file from the shard owning its filename.
+
+        Args:
+            filename (str): The name of the file to retrieve.
+
+        Returns:
+            _FileEntity: Either an instance of FileEntity or None.
+        """
+        return await self._shard(filename).get_file(filename)
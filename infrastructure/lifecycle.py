@@ -0,0 +1,267 @@
+"""
+Module: lifecycle
+
+This module defines the `Lifecycle` class, which owns the start-up and shutdown
+sequence of the application. It connects Tortoise ORM, builds the adapters the web
+layer depends on the first time they are requested, reports liveness and readiness
+to the health endpoints, and drains in-flight uploads before closing the database
+connections on shutdown.
+
+Schema creation is deliberately not part of start-up; the database schema is owned
+by the aerich migrations under `migrations/` and applied with `aerich upgrade`.
+
+Example Use Case:
+    - Rolling deploys where a terminating instance stops taking new uploads, lets the
+      ones already running finish, and only then releases its database connections.
+"""
+import asyncio
+import enum
+import logging
+from contextlib import asynccontextmanager
+from functools import cached_property
+from typing import AsyncIterator
+
+from tortoise import Tortoise
+
+from infrastructure.monitoring.loop_monitor import loop_monitor
+from infrastructure.settings import TORTOISE_ORM, settings
+
+logger = logging.getLogger(__name__)
+
+
+class LifecycleState(str, enum.Enum):
+    """
+    The phases an application instance moves through, in order.
+    """
+
+    STARTING = "starting"
+    READY = "ready"
+    DRAINING = "draining"
+    STOPPED = "stopped"
+
+
+class ServiceUnavailableError(Exception):
+    """
+    Raised when an upload is attempted while the application is not accepting work.
+    """
+
+
+class Lifecycle:
+    """
+    Lifecycle coordinates application start-up, readiness and graceful shutdown.
+
+    Adapters are exposed as lazily evaluated properties so that importing the web
+    layer has no side effects; the repository, notifier and use case are only
+    created when the first request needs them.
+
+    Attributes:
+        state (LifecycleState): The current phase of the application.
+        grace_period (float): Seconds readiness fails before the listener is stopped.
+        drain_timeout (float): Seconds to wait for in-flight uploads on shutdown.
+    """
+
+    def __init__(self, grace_period: float = settings.SHUTDOWN_GRACE_PERIOD,
+                 drain_timeout: float = settings.SHUTDOWN_DRAIN_TIMEOUT) -> None:
+        """
+        Initialize the Lifecycle in the `STARTING` state.
+
+        Args:
+            grace_period (float): Seconds readiness fails, with the listener still open,
+                                  before `start_draining` returns.
+            drain_timeout (float): Seconds to wait for in-flight uploads to finish
+                                   before connections are closed regardless.
+        """
+        self.state = LifecycleState.STARTING
+        self.grace_period = grace_period
+        self.drain_timeout = drain_timeout
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @cached_property
+    def file_repo(self):
+        """
+        The file repository used by the upload use case, created on first access and
+        selected by `settings.STORAGE_BACKEND`.
+
+        Raises:
+            ValueError: If the storage backend is not supported.
+        """
+        if settings.STORAGE_BACKEND == "segment":
+            from infrastructure.adapters.segment_file_repository import SegmentFile
+
+            return SegmentFile()
+
+        if settings.STORAGE_BACKEND == "sharded-db":
+            from infrastructure.adapters.sharded_db_file_repository import ShardedDBFile
+
+            return ShardedDBFile(settings.DB_SHARDS)
+
+        if settings.STORAGE_BACKEND == "file":
+            from infrastructure.adapters.file_repository import File
+
+            return File()
+
+        if settings.STORAGE_BACKEND == "db":
+            from infrastructure.adapters.db_file_repository import DBFile
+
+            return DBFile()
+
+        raise ValueError(
+            f"Unknown storage backend '{settings.STORAGE_BACKEND}', expected one of db, sharded-db, file, segment"
+        )
+
+    @cached_property
+    def progress_notifier(self):
+        """
+        The progress notifier used by the upload use case, created on first access.
+        """
+        from infrastructure.adapters.websocket_progress_notifier import WebSocketProgressNotifier
+        from infrastructure.web.handlers.websocket_handler import ProgressWebSocketHandler
+
+        return WebSocketProgressNotifier(ProgressWebSocketHandler)
+
+    @cached_property
+    def durability(self):
+        """
+        The durability policy for completed uploads, created on first access and
+        configured by `settings.DURABILITY_MODE` and `settings.GROUP_COMMIT_WINDOW`.
+        """
+        from application.durability import DurabilityPolicy
+
+        return DurabilityPolicy(self.file_repo, settings.DURABILITY_MODE, settings.GROUP_COMMIT_WINDOW)
+
+    @cached_property
+    def upload_coordinator(self):
+        """
+        The coordinator of concurrent uploads of the same filename, created on first
+        access and configured by `settings.UPLOAD_CONFLICT_MODE` and `settings.UPLOAD_DEDUP`.
+        """
+        from application.upload_coordinator import UploadCoordinator
+
+        return UploadCoordinator(settings.UPLOAD_CONFLICT_MODE, settings.UPLOAD_DEDUP)
+
+    @cached_property
+    def upload_use_case(self):
+        """
+        The upload use case wired with the repository, notifier, durability policy and
+        upload coordinator, created on first access.
+        """
+        from application.upload_use_case import UploadUseCase
+
+        return UploadUseCase(self.file_repo, self.progress_notifier, self.durability, self.upload_coordinator)
+
+    @property
+    def is_alive(self) -> bool:
+        """
+        Whether the process is running and able to answer requests at all.
+        """
+        return self.state is not LifecycleState.STOPPED
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        Whether the instance should receive new uploads.
+        """
+        return self.state is LifecycleState.READY
+
+    @property
+    def in_flight(self) -> int:
+        """
+        The number of uploads currently being processed.
+        """
+        return self._in_flight
+
+    async def startup(self) -> None:
+        """
+        Connect Tortoise ORM, build and open the upload adapters, start the IOLoop
+        monitor and mark the instance as ready.
+
+        Schemas are not generated here; run the aerich migrations beforehand.
+
+        Raises:
+            ValueError: If a storage, durability or upload coordination setting is invalid.
+        """
+        await Tortoise.init(config=TORTOISE_ORM)
+        try:
+            # Built now so that invalid settings fail start-up instead of every upload.
+            self.durability
+            self.upload_coordinator
+            # Repositories with start-up work (e.g. cleaning up after a crash) do it
+            # before any upload is accepted.
+            open_repo = getattr(self.file_repo, "open", None)
+            if open_repo is not None:
+                await open_repo()
+        except Exception:
+            await Tortoise.close_connections()
+            raise
+        if loop_monitor.interval > 0:
+            loop_monitor.start()
+        self.state = LifecycleState.READY
+
+    def begin_upload(self) -> None:
+        """
+        Register an upload as in flight. Every call must be paired with `end_upload`.
+
+        Raises:
+            ServiceUnavailableError: If the instance is not ready to accept uploads.
+        """
+        if not self.is_ready:
+            raise ServiceUnavailableError(f"Service is {self.state.value}, not accepting uploads")
+
+        self._in_flight += 1
+        self._idle.clear()
+
+    def end_upload(self) -> None:
+        """
+        Mark an upload registered with `begin_upload` as finished.
+        """
+        self._in_flight -= 1
+        if self._in_flight == 0:
+            self._idle.set()
+
+    @asynccontextmanager
+    async def track_upload(self) -> AsyncIterator[None]:
+        """
+        Register an upload as in flight for the duration of the context.
+
+        Raises:
+            ServiceUnavailableError: If the instance is not ready to accept uploads.
+        """
+        self.begin_upload()
+        try:
+            yield
+        finally:
+            self.end_upload()
+
+    async def start_draining(self) -> None:
+        """
+        Stop accepting uploads and fail readiness, then wait `grace_period` seconds so
+        that load balancers see `/readyz` report draining and stop routing to this
+        instance before its listener is stopped.
+        """
+        self.state = LifecycleState.DRAINING
+        await asyncio.sleep(self.grace_period)
+
+    async def shutdown(self) -> None:
+        """
+        Stop accepting uploads, if `start_draining` has not already, wait up to
+        `drain_timeout` seconds for the in-flight ones to finish, then close the file
+        repository, if one was created, and the Tortoise connections.
+        """
+        self.state = LifecycleState.DRAINING
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Shutdown drain timed out with %d upload(s) still in flight", self._in_flight)
+        finally:
+            close = getattr(self.__dict__.get("file_repo"), "close", None)
+            if close is not None:
+                await close()
+            await Tortoise.close_connections()
+            loop_monitor.stop()
+            self.state = LifecycleState.STOPPED
+
+
+# Create a global lifecycle instance
+lifecycle = Lifecycle()
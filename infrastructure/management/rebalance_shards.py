@@ -0,0 +1,138 @@
+"""
+Module: rebalance_shards
+
+Offline tool for the "sharded-db" storage backend. It creates the `files` table in
+every shard and, when the number of shards changes, moves each file whose owning shard
+changed from its old shard to its new one.
+
+Shards are assigned with jump consistent hashing, so growing from N to M shards only
+moves files into the new shards, and shrinking only moves files out of the removed
+ones. Each file is copied before it is deleted from its old shard, so an interrupted
+run can simply be started again. Run it while the server is stopped:
+
+    python -m infrastructure.management.rebalance_shards --from 4 --to 8
+
+With `--from` equal to `--to` (the default) it only initialises the shards.
+"""
+import argparse
+import asyncio
+
+from tortoise import Tortoise, connections
+from tortoise.transactions import in_transaction
+
+from infrastructure.adapters.sharded_db_file_repository import shard_for
+from infrastructure.models.file_model import FileChunkModel, FileModel
+from infrastructure.settings import TORTOISE_ORM, settings, shard_connections
+
+# Same tables as the migrations under migrations/models/; shards are not managed by aerich.
+FILES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS "files" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "filename" VARCHAR(255) NOT NULL UNIQUE,
+    "content" BLOB,
+    "upload" VARCHAR(32)
+);
+CREATE TABLE IF NOT EXISTS "file_chunks" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "upload" VARCHAR(32) NOT NULL,
+    "seq" INT NOT NULL,
+    "data" BLOB NOT NULL,
+    CONSTRAINT "uid_file_chunks_upload_seq" UNIQUE ("upload", "seq")
+);
+CREATE INDEX IF NOT EXISTS "idx_file_chunks_upload" ON "file_chunks" ("upload");"""
+
+
+async def _create_tables(connection) -> None:
+    """
+    Creates the tables of a shard, adding the `upload` column to shards created before
+    files were stored as chunk rows.
+    """
+    await connection.execute_script(FILES_TABLE_SQL)
+    _, columns = await connection.execute_query('PRAGMA table_info("files")')
+    if all(column["name"] != "upload" for column in columns):
+        await connection.execute_script('ALTER TABLE "files" ADD "upload" VARCHAR(32)')
+
+
+async def rebalance(source_count: int, target_count: int, dry_run: bool = False) -> int:
+    """
+    Moves every file to the shard that owns it among `target_count` shards.
+
+    Args:
+        source_count (int): The number of shards the files are currently spread over.
+        target_count (int): The number of shards to spread the files over.
+        dry_run (bool): Only print the planned moves.
+
+    Returns:
+        int: The number of files moved.
+    """
+    config = {
+        **TORTOISE_ORM,
+        "connections": {"default": settings.DATABASE_URL, **shard_connections(max(source_count, target_count))},
+    }
+    await Tortoise.init(config=config)
+    moved = 0
+
+    try:
+        for shard in range(max(source_count, target_count)):
+            await _create_tables(connections.get(f"shard_{shard}"))
+
+        for source in range(source_count):
+            source_db = connections.get(f"shard_{source}")
+            rows = await FileModel.all().using_db(source_db).values_list("id", "filename")
+
+            for record_id, filename in rows:
+                target = shard_for(filename, target_count)
+                if target == source:
+                    continue
+
+                print(f"{filename}: shard_{source} -> shard_{target}")
+                moved += 1
+                if dry_run:
+                    continue
+
+                record = await FileModel.get(id=record_id, using_db=source_db)
+                chunks = []
+                if record.upload is not None:
+                    chunks = await FileChunkModel.filter(upload=record.upload).using_db(source_db) \
+                        .values_list("seq", "data")
+
+                async with in_transaction(f"shard_{target}") as target_db:
+                    existing = await FileModel.get_or_none(filename=filename, using_db=target_db)
+                    if existing is None:
+                        existing = FileModel(filename=filename)
+                    elif existing.upload is not None:
+                        # Left by an interrupted run; replaced below.
+                        await FileChunkModel.filter(upload=existing.upload).using_db(target_db).delete()
+                    await FileChunkModel.bulk_create(
+                        [FileChunkModel(upload=record.upload, seq=seq, data=data) for seq, data in chunks],
+                        using_db=target_db,
+                    )
+                    existing.content = record.content
+                    existing.upload = record.upload
+                    await existing.save(using_db=target_db)
+
+                async with in_transaction(f"shard_{source}") as source_db_transaction:
+                    if record.upload is not None:
+                        await FileChunkModel.filter(upload=record.upload).using_db(source_db_transaction).delete()
+                    await record.delete(using_db=source_db_transaction)
+    finally:
+        await Tortoise.close_connections()
+
+    return moved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Initialise and rebalance the SQLite shards.")
+    parser.add_argument("--from", dest="source", type=int, default=settings.DB_SHARDS)
+    parser.add_argument("--to", dest="target", type=int, default=settings.DB_SHARDS)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    moved = asyncio.run(rebalance(args.source, args.target, args.dry_run))
+    print(f"{'Would move' if args.dry_run else 'Moved'} {moved} file(s)")
+    if args.target < args.source and not args.dry_run:
+        print(f"Shards {args.target} to {args.source - 1} are now empty and can be removed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Module: reshard_uploads
+
+Offline tool that migrates the upload directory used by the `File` repository into the
+hash-sharded layout. It handles two cases in one pass:
+
+    - Files stored by earlier versions directly in the flat upload directory under their
+      client-supplied names are moved into their hash-prefix directory and indexed.
+    - Files already indexed under a different layout (e.g. after changing the shard
+      depth or width) are moved to their path under the requested layout.
+
+Files are moved with `os.replace`, so the upload directory must be on a single file
+system. Run it while the server is stopped:
+
+    python -m infrastructure.management.reshard_uploads --depth 2 --width 2
+"""
+import argparse
+import os
+
+from infrastructure.adapters.file_repository import (
+    INDEX_FILENAME, SHARD_DEPTH, SHARD_WIDTH, UPLOAD_DIR, NameIndex, ShardedLayout,
+)
+
+
+def _move(upload_dir: str, source: str, target: str, dry_run: bool) -> None:
+    print(f"{source} -> {target}")
+    if not dry_run:
+        source_path = os.path.join(upload_dir, source)
+        if not os.path.exists(source_path):
+            # Indexed by an upload that was never published; only the index entry moves.
+            return
+        target_path = os.path.join(upload_dir, target)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        os.replace(source_path, target_path)
+        source_dir = os.path.dirname(source)
+        if source_dir:
+            try:
+                # Prune shard directories emptied by the move.
+                os.removedirs(os.path.join(upload_dir, source_dir))
+            except OSError:
+                pass
+
+
+def reshard(upload_dir: str, layout: ShardedLayout, dry_run: bool = False) -> int:
+    """
+    Moves every flat or differently-sharded file in `upload_dir` to its path under `layout`.
+
+    Args:
+        upload_dir (str): The upload directory to migrate.
+        layout (ShardedLayout): The target layout.
+        dry_run (bool): Only print the planned moves.
+
+    Returns:
+        int: The number of files moved.
+    """
+    index = NameIndex(os.path.join(upload_dir, INDEX_FILENAME))
+    moved = 0
+
+    try:
+        for filename, stored in index.items():
+            target = layout.stored_path(filename)
+            if stored != target:
+                _move(upload_dir, stored, target, dry_run)
+                if not dry_run:
+                    index.set(filename, target)
+                moved += 1
+
+        with os.scandir(upload_dir) as entries:
+            flat_files = [
+                entry.name for entry in entries
+                if entry.is_file(follow_symlinks=False) and not entry.name.startswith(INDEX_FILENAME)
+            ]
+
+        for filename in flat_files:
+            if index.get(filename) is not None:
+                print(f"skipping {filename}: name is already indexed")
+                continue
+            target = layout.stored_path(filename)
+            _move(upload_dir, filename, target, dry_run)
+            if not dry_run:
+                index.set(filename, target)
+            moved += 1
+    finally:
+        index.close()
+
+    return moved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate the upload directory to the hash-sharded layout.")
+    parser.add_argument("--upload-dir", default=UPLOAD_DIR)
+    parser.add_argument("--depth", type=int, default=SHARD_DEPTH)
+    parser.add_argument("--width", type=int, default=SHARD_WIDTH)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    moved = reshard(args.upload_dir, ShardedLayout(args.depth, args.width), args.dry_run)
+    print(f"{'Would move' if args.dry_run else 'Moved'} {moved} file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,4 +9,18 @@ class FileModel(models.Model):
 
     id = fields.IntField(primary_key=True)
     filename = fields.CharField(max_length=255, unique=True)
-    content = fields.BinaryField(null=True)
\ No newline at end of file
+    content = fields.BinaryField(null=True)
+    # Set when the content is stored as FileChunkModel rows of this upload instead.
+    upload = fields.CharField(max_length=32, null=True)
+
+
+class FileChunkModel(models.Model):
+
+    class Meta:
+        table = "file_chunks"
+        unique_together = (("upload", "seq"),)
+
+    id = fields.IntField(primary_key=True)
+    upload = fields.CharField(max_length=32, db_index=True)
+    seq = fields.IntField()
+    data = fields.BinaryField()
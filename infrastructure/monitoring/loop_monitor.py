@@ -0,0 +1,199 @@
+"""
+Module: loop_monitor
+
+This module defines the `LoopMonitor` class, which continuously measures how late the
+IOLoop runs scheduled callbacks and detects callbacks that block it.
+
+A heartbeat coroutine sleeps for a fixed interval and records how much later than
+requested it woke up into a `Histogram`. A watchdog thread watches the heartbeat; when
+the loop has not ticked for longer than the blocking threshold, it captures the stack of
+the loop thread at that moment, identifies the request being handled from the
+`RequestHandler` found on that stack, logs it and keeps it for the `/debug/loop` endpoint.
+
+Example Use Case:
+    - Finding which handler or adapter performs synchronous I/O or large copies on the
+      event loop and thereby stalls every other connection.
+"""
+import asyncio
+import bisect
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Optional
+
+from infrastructure.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the lag histogram buckets.
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float("inf"))
+MAX_STALLS = 50  # Number of most recent blocking events kept for inspection.
+
+
+class Histogram:
+    """
+    Histogram counts observations into fixed, cumulative upper-bound buckets.
+
+    Attributes:
+        buckets (tuple): The upper bounds of the buckets, ending with infinity.
+        counts (List[int]): The number of observations falling in each bucket.
+        total (float): The sum of all observations.
+        count (int): The number of observations.
+    """
+
+    def __init__(self, buckets: tuple = LAG_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Records a single observation.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns the histogram as cumulative bucket counts, Prometheus style.
+        """
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {"buckets": cumulative, "sum": self.total, "count": self.count}
+
+
+class LoopMonitor:
+    """
+    LoopMonitor measures IOLoop scheduling lag and reports callbacks that block the loop.
+
+    Attributes:
+        interval (float): Seconds between heartbeats.
+        threshold (float): Seconds without a heartbeat after which the loop is considered blocked.
+        histogram (Histogram): The distribution of observed scheduling lag.
+        stalls (Deque[dict]): The most recent blocking events, newest last.
+    """
+
+    def __init__(self, interval: float = settings.LOOP_MONITOR_INTERVAL,
+                 threshold: float = settings.LOOP_BLOCK_THRESHOLD) -> None:
+        """
+        Initialize the LoopMonitor.
+
+        Args:
+            interval (float): Seconds between heartbeats.
+            threshold (float): Seconds without a heartbeat after which the loop is
+                               considered blocked and its stack is captured.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.histogram = Histogram()
+        self.stalls: Deque[dict] = deque(maxlen=MAX_STALLS)
+
+        self._heartbeat = time.monotonic()
+        self._reported_heartbeat: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Starts the heartbeat on the running loop and the watchdog thread.
+        """
+        if self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """
+        Stops the heartbeat and the watchdog thread.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._stopped.set()
+
+    def snapshot(self) -> dict:
+        """
+        Returns the lag histogram and recent blocking events.
+        """
+        return {
+            "interval": self.interval,
+            "threshold": self.threshold,
+            "lag_seconds": self.histogram.snapshot(),
+            "stalls": list(self.stalls),
+        }
+
+    async def _beat(self) -> None:
+        """
+        Sleeps for `interval` in a loop, recording how late each wake-up is.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.histogram.observe(max(0.0, loop.time() - started - self.interval))
+
+    def _watch(self) -> None:
+        """
+        Watchdog thread body: reports each stall once, while it is still in progress.
+        """
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for > self.threshold and heartbeat != self._reported_heartbeat:
+                self._reported_heartbeat = heartbeat
+                self._report(blocked_for)
+
+    def _report(self, blocked_for: float) -> None:
+        """
+        Captures the loop thread's stack and records a blocking event.
+        """
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+
+        stall = {
+            "at": time.time(),
+            "blocked_for": round(blocked_for, 6),
+            "route": _find_route(frame),
+            "stack": traceback.format_stack(frame),
+        }
+        self.stalls.append(stall)
+        logger.warning(
+            "IOLoop blocked for %.3fs while handling %s:\n%s",
+            blocked_for, stall["route"] or "no request", "".join(stall["stack"]),
+        )
+
+
+def _find_route(frame) -> Optional[str]:
+    """
+    Walks a stack from the innermost frame outwards and describes the request of the
+    first `RequestHandler` found as `self`, e.g. `POST /upload (FileUploadHandler)`.
+    """
+    from tornado.web import RequestHandler
+
+    while frame is not None:
+        handler = frame.f_locals.get("self")
+        if isinstance(handler, RequestHandler):
+            request = handler.request
+            return f"{request.method} {request.path} ({type(handler).__name__})"
+        frame = frame.f_back
+    return None
+
+
+# Create a global loop monitor instance
+loop_monitor = LoopMonitor()
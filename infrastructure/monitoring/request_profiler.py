@@ -0,0 +1,179 @@
+"""
+Module: request_profiler
+
+This module defines the `RequestProfiler` class, a sampling profiler for a configurable
+subset of requests: one in every N, plus any request whose profiling header carries the
+configured secret, so that clients cannot make the server profile them at will.
+
+cProfile follows a single thread, so on an event loop it would mix the work of every
+coroutine interleaved with the sampled request. Instead, while a sampled request is in
+progress, a sampler thread periodically captures the loop thread's stack and keeps the
+sample only if that request's handler is on it, i.e. only while the loop is actually
+running code on the request's behalf. Samples are aggregated per route (method and
+handler class) and can be exported as collapsed stacks for flamegraph tools.
+
+Example Use Case:
+    - Finding whether `/upload` time goes to validation, chunking, the ORM or WebSocket
+      fan-out, by profiling 1 in 100 production requests.
+"""
+import hmac
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+
+from infrastructure.settings import settings
+
+
+class RequestProfiler:
+    """
+    RequestProfiler samples the stacks of selected requests and aggregates them per route.
+
+    Attributes:
+        sample_every (int): Profile one in every `sample_every` requests; 0 disables sampling.
+        header (str): Requests whose header of this name equals the secret are always profiled.
+        interval (float): Seconds between stack samples.
+    """
+
+    def __init__(self, sample_every: int = settings.PROFILE_SAMPLE_EVERY,
+                 header: str = settings.PROFILE_HEADER,
+                 interval: float = settings.PROFILE_INTERVAL,
+                 secret: str = settings.ADMIN_TOKEN) -> None:
+        """
+        Initialize the RequestProfiler.
+
+        Args:
+            sample_every (int): Profile one in every `sample_every` requests; 0 disables sampling.
+            header (str): Requests whose header of this name equals `secret` are always profiled.
+            interval (float): Seconds between stack samples.
+            secret (str): The value the header must carry; empty disables header-triggered profiling.
+        """
+        self.sample_every = sample_every
+        self.header = header
+        self.interval = interval
+        self._secret = secret.encode()
+
+        self._counter = itertools.count(1)
+        self._active: Dict[int, str] = {}
+        self._stacks: Dict[str, Counter] = defaultdict(Counter)
+        self._requests: Counter = Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+
+    def begin(self, handler) -> None:
+        """
+        Decides whether a request is profiled and, if so, starts sampling it. Must be
+        called on the event loop thread, typically from `RequestHandler.prepare`.
+
+        Args:
+            handler (RequestHandler): The handler of the request.
+        """
+        sampled = self.sample_every > 0 and next(self._counter) % self.sample_every == 0
+        if not sampled and not self._requested(handler):
+            return
+
+        route = f"{handler.request.method} {type(handler).__name__}"
+        with self._lock:
+            self._active[id(handler)] = route
+            self._requests[route] += 1
+
+        if self._sampler is None:
+            self._loop_thread_id = threading.get_ident()
+            self._sampler = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+            self._sampler.start()
+        self._wake.set()
+
+    def _requested(self, handler) -> bool:
+        """
+        Returns whether the request asks to be profiled with the right secret.
+        """
+        value = handler.request.headers.get(self.header)
+        return bool(self._secret) and value is not None and hmac.compare_digest(value.encode(), self._secret)
+
+    def end(self, handler) -> None:
+        """
+        Stops sampling a request. Calling it for a request that is not profiled is harmless.
+
+        Args:
+            handler (RequestHandler): The handler of the request.
+        """
+        with self._lock:
+            self._active.pop(id(handler), None)
+            if not self._active:
+                self._wake.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns, per route, how many requests were profiled and how many samples they got.
+        """
+        with self._lock:
+            return {
+                route: {"requests": self._requests[route], "samples": sum(self._stacks[route].values())}
+                for route in self._requests
+            }
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """
+        Returns the samples in collapsed-stack format (`frame;frame;... count` per line),
+        as consumed by flamegraph.pl and speedscope, with the route as the root frame.
+
+        Args:
+            route (Optional[str]): Only include this route; all routes if None.
+        """
+        with self._lock:
+            lines = [
+                f"{name};{stack} {count}"
+                for name, stacks in self._stacks.items() if route is None or name == route
+                for stack, count in stacks.most_common()
+            ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def reset(self) -> None:
+        """
+        Discards all aggregated samples.
+        """
+        with self._lock:
+            self._stacks.clear()
+            self._requests.clear()
+
+    def _sample(self) -> None:
+        """
+        Sampler thread body: records the loop thread's stack while a profiled request's
+        handler is on it.
+        """
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            with self._lock:
+                active = dict(self._active)
+            if not active or frame is None:
+                continue
+
+            # Keep the frames up to the outermost one belonging to a profiled handler.
+            labels, route, depth = [], None, 0
+            while frame is not None:
+                labels.append(_label(frame))
+                owner = active.get(id(frame.f_locals.get("self")))
+                if owner is not None:
+                    route, depth = owner, len(labels)
+                frame = frame.f_back
+
+            if route is not None:
+                with self._lock:
+                    self._stacks[route][";".join(reversed(labels[:depth]))] += 1
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+# Create a global request profiler instance
+request_profiler = RequestProfiler()
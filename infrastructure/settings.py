@@ -14,23 +14,63 @@ class Settings:
         load_dotenv()
 
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        print(project_root, "\n")
         # Use SQLite as the default database
         default_db_path = os.path.join(project_root, "db.sqlite3")
-        print(default_db_path, "\n")
         self.DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{default_db_path}")
         # include project settings here
         self.NUMBER_UPLOAD_CHUNK = os.getenv("NUMBER_UPLOAD_CHUNK", 10)
         self.TRACE_MEMORY_ALLOCATION_PER_FRAME = os.getenv("TRACE_MEMORY_ALLOCATION_PER_FRAME", 20)
+        # File repository backing uploads: "db", "sharded-db", "file" or "segment"
+        self.STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "db")
+        # Number of SQLite shards, and their URL with a "{shard}" placeholder, for the "sharded-db" backend
+        self.DB_SHARDS = int(os.getenv("DB_SHARDS", 4))
+        default_shard_path = os.path.join(project_root, "db.shard-{shard}.sqlite3")
+        self.DB_SHARD_URL = os.getenv("DB_SHARD_URL", f"sqlite:///{default_shard_path}")
+        # When completed uploads are fsynced: "none", "per-upload" or "group-commit"
+        self.DURABILITY_MODE = os.getenv("DURABILITY_MODE", "none")
+        # Seconds a group-commit batch waits for more uploads before syncing
+        self.GROUP_COMMIT_WINDOW = float(os.getenv("GROUP_COMMIT_WINDOW", 0.005))
+        # Concurrent uploads of one filename: "serialize" or "reject" conflicting writers, and
+        # collapse identical ones matched by "digest" or "size" ("off" never collapses)
+        self.UPLOAD_CONFLICT_MODE = os.getenv("UPLOAD_CONFLICT_MODE", "serialize")
+        self.UPLOAD_DEDUP = os.getenv("UPLOAD_DEDUP", "digest")
+        # IOLoop lag monitor: heartbeat period and stall threshold in seconds (interval 0 disables it)
+        self.LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", 0.05))
+        self.LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD", 0.2))
+        # Largest request body accepted by the streaming PUT /files/{name} endpoint, in bytes; the
+        # database backends read files back into memory whole, so their default is lower
+        default_stream_max = 1024 ** 3 if self.STORAGE_BACKEND in ("db", "sharded-db") else 10 * 1024 ** 3
+        self.STREAM_MAX_BODY_SIZE = int(os.getenv("STREAM_MAX_BODY_SIZE", default_stream_max))
+        # Bearer token required by the /debug/* endpoints, which are disabled while it is empty
+        self.ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+        # Request profiler: sample 1 in N requests (0 disables), always sample requests whose header
+        # equals ADMIN_TOKEN, and take a stack sample every interval seconds while a sampled request runs
+        self.PROFILE_SAMPLE_EVERY = int(os.getenv("PROFILE_SAMPLE_EVERY", 0))
+        self.PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+        self.PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+        # Seconds /readyz reports draining before the listener stops on shutdown, so load balancers
+        # stop routing to the instance first
+        self.SHUTDOWN_GRACE_PERIOD = float(os.getenv("SHUTDOWN_GRACE_PERIOD", 5))
+        # Seconds to wait for in-flight uploads to finish on shutdown
+        self.SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", 30))
 
 
 
 # Create a global settings instance
 settings = Settings()
 
+
+def shard_connections(count: int) -> dict:
+    """
+    Returns the Tortoise connection names and URLs of `count` database shards.
+    """
+    return {f"shard_{shard}": settings.DB_SHARD_URL.format(shard=shard) for shard in range(count)}
+
+
 TORTOISE_ORM = {
     "connections": {
-        "default": settings.DATABASE_URL
+        "default": settings.DATABASE_URL,
+        **(shard_connections(settings.DB_SHARDS) if settings.STORAGE_BACKEND == "sharded-db" else {}),
     },
     "apps": {
         "models": {
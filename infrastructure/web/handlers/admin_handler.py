@@ -0,0 +1,56 @@
+"""
+Module: admin_handler
+
+This module defines the `AdminHandler` class, the base of the `/debug/*` endpoints.
+Those endpoints publish stack traces and internal counters and can reset profiling
+data, so they share the public port only behind a bearer token: requests must send
+`Authorization: Bearer <ADMIN_TOKEN>`, and the endpoints are disabled altogether while
+no token is configured.
+
+Example Use Case:
+    - `curl -H "Authorization: Bearer $ADMIN_TOKEN" http://host/debug/loop` from an
+      operator's shell, while the same URL answers 403 to anyone else.
+"""
+import hmac
+from typing import Optional
+
+import tornado.web
+
+
+class AdminHandler(tornado.web.RequestHandler):
+    """
+    AdminHandler refuses every request that does not carry the admin token.
+
+    Attributes:
+        HTTP_UNAUTHORIZED (int): HTTP status code when the token is missing or wrong.
+        HTTP_FORBIDDEN (int): HTTP status code while no admin token is configured.
+        admin_token (Optional[str]): The token requests must present; None or empty disables the endpoint.
+    """
+
+    HTTP_UNAUTHORIZED = 401
+    HTTP_FORBIDDEN = 403
+
+    def initialize(self, admin_token: Optional[str]) -> None:
+        """
+        Initializes the handler with the admin token.
+
+        Args:
+            admin_token (Optional[str]): The token requests must present; None or empty
+                                         disables the endpoint.
+        """
+        self.admin_token = admin_token
+
+    def prepare(self) -> None:
+        """
+        Rejects the request unless it carries the admin token as a bearer token.
+        """
+        if not self.admin_token:
+            self.set_status(self.HTTP_FORBIDDEN)
+            self.finish({"status": "error", "message": "Admin endpoints are disabled; set ADMIN_TOKEN"})
+            return
+
+        scheme, _, token = self.request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), self.admin_token.encode()):
+            self.set_status(self.HTTP_UNAUTHORIZED)
+            self.set_header("WWW-Authenticate", "Bearer")
+            self.finish({"status": "error", "message": "Missing or invalid admin token"})
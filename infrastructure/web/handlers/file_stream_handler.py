@@ -0,0 +1,182 @@
+"""
+Module: file_stream_handler
+
+This module defines the `FileStreamHandler` class, which accepts raw binary uploads via
+`PUT /files/{name}`. The request body is the file content itself, sent either with a
+`Content-Length` or with chunked transfer-encoding.
+
+Unlike `/upload`, the body is neither wrapped in multipart/form-data nor buffered: each
+piece is handed to an `UploadStream` and written to the configured repository as soon
+as Tornado reads it from the socket.
+
+Example Use Case:
+    - Machine-to-machine ingest, e.g. `curl -T report.csv http://host/files/report.csv`.
+"""
+from typing import Optional
+
+import tornado.web
+
+from application.upload_coordinator import UploadConflictError
+from application.upload_use_case import CoordinatedUploadStream
+from infrastructure.lifecycle import Lifecycle, ServiceUnavailableError
+from infrastructure.monitoring.request_profiler import RequestProfiler
+from infrastructure.web.handlers.file_upload_handler import FileUploadHandler
+
+
+@tornado.web.stream_request_body
+class FileStreamHandler(FileUploadHandler):
+    """
+    FileStreamHandler streams raw PUT request bodies straight into the file repository.
+
+    It reuses the JSON response and error handling of FileUploadHandler, but only
+    accepts PUT.
+
+    Attributes:
+        max_body_size (int): The largest request body accepted, in bytes.
+    """
+
+    SUPPORTED_METHODS = ("PUT",)
+
+    def initialize(self, lifecycle: Lifecycle, profiler: RequestProfiler, max_body_size: int) -> None:
+        """
+        Initializes the FileStreamHandler.
+
+        Args:
+            lifecycle (Lifecycle): The lifecycle providing the upload use case and
+                                   tracking in-flight uploads for graceful shutdown.
+            profiler (RequestProfiler): The profiler deciding whether this request is sampled.
+            max_body_size (int): The largest request body accepted, in bytes.
+        """
+        super().initialize(lifecycle, profiler)
+        self.max_body_size = max_body_size
+        self._stream: Optional[CoordinatedUploadStream] = None
+        self._stream_error: Optional[Exception] = None
+        self._tracked = False
+        self._closed = False
+
+    async def prepare(self) -> None:
+        """
+        Opens the upload stream before the body is read. Refuses the upload if its
+        Content-Length is malformed, while the service is not ready or, if conflicts are
+        rejected, while the same filename is being uploaded; otherwise waits for its turn
+        before the body is read. Raises the body size limit for this request.
+        """
+        super().prepare()
+        try:
+            total_size = self._content_length()
+        except ValueError as exception:
+            self.send_error(self.HTTP_BAD_REQUEST, error=exception.args[0])
+            return
+
+        try:
+            self.lifecycle.begin_upload()
+        except ServiceUnavailableError as exception:
+            self.send_error(self.HTTP_SERVICE_UNAVAILABLE, error=exception.args[0])
+            return
+        self._tracked = True
+
+        self.request.connection.set_max_body_size(self.max_body_size)
+
+        filename = self.path_args[0]
+        try:
+            self._stream = await self.lifecycle.upload_use_case.open_stream(filename, total_size)
+        except UploadConflictError as exception:
+            self.send_error(self.HTTP_CONFLICT, error=exception.args[0])
+            return
+
+        if self._closed:
+            # The client went away while waiting for its turn.
+            self._abort(ConnectionError("Client disconnected"))
+
+    async def data_received(self, chunk: bytes) -> None:
+        """
+        Writes the next piece of the body to the repository. Tornado waits for this
+        coroutine before reading more from the socket, so a slow repository applies
+        back-pressure to the client instead of accumulating data in memory.
+
+        Args:
+            chunk (bytes): The next piece of the request body.
+        """
+        if self._stream is None or self._stream_error is not None:
+            return
+
+        try:
+            await self._stream.write(chunk)
+        except Exception as exception:
+            # Remember the failure and report it once the whole body has been received.
+            self._stream_error = exception
+
+    async def put(self, filename: str) -> None:
+        """
+        Completes the upload once the whole body has been received.
+
+        Returns:
+            A JSON response with the status of the upload operation.
+        """
+        try:
+            if self._stream_error is not None:
+                self._abort(self._stream_error)
+                raise self._stream_error
+
+            size = await self._stream.finish()
+
+            self.set_status(self.HTTP_OK)
+            self.write({
+                "status": "success",
+                "message": f"File '{filename}' uploaded successfully!",
+                "size": size,
+            })
+
+        except Exception as exception:
+            self.send_error(self.HTTP_INTERNAL_SERVER_ERROR, error=exception.args[0] if exception.args else None)
+
+    def on_finish(self) -> None:
+        """
+        Releases the in-flight registration once the response has been sent.
+        """
+        super().on_finish()
+        self._release()
+
+    def on_connection_close(self) -> None:
+        """
+        Abandons the upload when the client disconnects mid-upload, releasing the
+        in-flight registration once the partial upload has been discarded.
+        """
+        self._closed = True
+        self.profiler.end(self)
+        if self._stream is not None:
+            self._abort(ConnectionError("Client disconnected"))
+        else:
+            self._release()
+
+    def _content_length(self) -> Optional[int]:
+        """
+        Returns the announced size of the body, or None for chunked uploads.
+
+        Raises:
+            ValueError: If the Content-Length header is not a non-negative integer.
+        """
+        content_length = self.request.headers.get("Content-Length")
+        if content_length is None:
+            return None
+        if not (content_length.isascii() and content_length.isdigit()):
+            raise ValueError(f"Invalid Content-Length '{content_length}'")
+        return int(content_length)
+
+    def _abort(self, error: Exception) -> None:
+        """
+        Abandons the upload, keeping it registered as in flight until it is discarded
+        so a graceful shutdown waits for the cleanup.
+        """
+        discarding = self._stream.abort(error)
+        if discarding is not None and self._tracked:
+            # Hand the registration over to the discard; on_finish must not release it.
+            self._tracked = False
+            discarding.add_done_callback(lambda _: self.lifecycle.end_upload())
+        elif self._closed:
+            self._release()
+
+    def _release(self) -> None:
+        if self._tracked:
+            self._tracked = False
+            self.lifecycle.end_upload()
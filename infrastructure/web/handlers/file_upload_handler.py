@@ -16,8 +16,10 @@ Example Use Case:
 
 import tornado.web
 
-from application.upload_use_case import UploadUseCase
+from application.upload_coordinator import UploadConflictError
 from domain.entity import FileEntity
+from infrastructure.lifecycle import Lifecycle, ServiceUnavailableError
+from infrastructure.monitoring.request_profiler import RequestProfiler
 from infrastructure.web.serializers import FileUploadSchema
 
 class FileUploadHandler(tornado.web.RequestHandler):
@@ -31,23 +33,41 @@ class FileUploadHandler(tornado.web.RequestHandler):
     Attributes:
         HTTP_OK (int): HTTP status code for successful responses.
         HTTP_BAD_REQUEST (int): HTTP status code for bad requests (e.g., missing file).
+        HTTP_CONFLICT (int): HTTP status code when the same file is already being uploaded.
         HTTP_INTERNAL_SERVER_ERROR (int): HTTP status code for server errors.
+        HTTP_SERVICE_UNAVAILABLE (int): HTTP status code while the service is not accepting uploads.
     """
 
     # Class-level constants for HTTP status codes
     HTTP_OK = 200
     HTTP_BAD_REQUEST = 400
+    HTTP_CONFLICT = 409
     HTTP_INTERNAL_SERVER_ERROR = 500
+    HTTP_SERVICE_UNAVAILABLE = 503
 
-    def initialize(self, upload_use_case: UploadUseCase) -> None:
+    def initialize(self, lifecycle: Lifecycle, profiler: RequestProfiler) -> None:
         """
-        Initializes the FileUploadHandler with the necessary upload use case.
+        Initializes the FileUploadHandler with the application lifecycle.
 
         Args:
-            upload_use_case (UploadUseCase): The use case responsible for handling
-                                             the file upload process and business logic.
+            lifecycle (Lifecycle): The lifecycle providing the upload use case and
+                                   tracking in-flight uploads for graceful shutdown.
+            profiler (RequestProfiler): The profiler deciding whether this request is sampled.
         """
-        self.upload_use_case = upload_use_case
+        self.lifecycle = lifecycle
+        self.profiler = profiler
+
+    def prepare(self) -> None:
+        """
+        Starts profiling the request if it is selected for sampling.
+        """
+        self.profiler.begin(self)
+
+    def on_finish(self) -> None:
+        """
+        Stops profiling the request once the response has been sent.
+        """
+        self.profiler.end(self)
 
     def set_default_headers(self) -> None:
         """
@@ -107,7 +127,8 @@ class FileUploadHandler(tornado.web.RequestHandler):
             file_entity = FileEntity(validated_data.filename, validated_data.content)
 
             # Execute the upload use case to handle the file storage process
-            await self.upload_use_case.execute(file_entity)
+            async with self.lifecycle.track_upload():
+                await self.lifecycle.upload_use_case.execute(file_entity)
 
             # Respond with success message in JSON format
             self.set_status(self.HTTP_OK)
@@ -120,6 +141,14 @@ class FileUploadHandler(tornado.web.RequestHandler):
             # Handle missing file key in the request
             self.send_error(self.HTTP_BAD_REQUEST, error=exception.args[0])
 
+        except UploadConflictError as exception:
+            # Another upload of the same filename is being written
+            self.send_error(self.HTTP_CONFLICT, error=exception.args[0])
+
+        except ServiceUnavailableError as exception:
+            # Refuse new uploads while starting up or draining
+            self.send_error(self.HTTP_SERVICE_UNAVAILABLE, error=exception.args[0])
+
         except Exception as exception:
             # Handle any other exceptions during the file upload process
             self.send_error(self.HTTP_INTERNAL_SERVER_ERROR, error=exception.args[0])
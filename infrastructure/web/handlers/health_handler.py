@@ -0,0 +1,72 @@
+"""
+Module: health_handler
+
+This module defines the `HealthHandler` and `ReadinessHandler` classes, which expose
+the liveness and readiness of the application to orchestrators and load balancers.
+
+Liveness answers "is the process up"; readiness answers "should this instance receive
+new uploads", and turns false as soon as a graceful shutdown starts draining.
+
+Example Use Case:
+    - A Kubernetes liveness probe on `/healthz` and readiness probe on `/readyz`, so that
+      a terminating pod is removed from the service before its in-flight uploads finish.
+"""
+import tornado.web
+
+from infrastructure.lifecycle import Lifecycle
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    """
+    HealthHandler reports whether the application process is alive.
+
+    Attributes:
+        HTTP_OK (int): HTTP status code returned while the process is alive.
+        HTTP_SERVICE_UNAVAILABLE (int): HTTP status code returned once the process has stopped.
+    """
+
+    HTTP_OK = 200
+    HTTP_SERVICE_UNAVAILABLE = 503
+
+    def initialize(self, lifecycle: Lifecycle) -> None:
+        """
+        Initializes the handler with the application lifecycle.
+
+        Args:
+            lifecycle (Lifecycle): The lifecycle whose state is reported.
+        """
+        self.lifecycle = lifecycle
+
+    def set_default_headers(self) -> None:
+        """
+        Sets default headers to ensure all responses are returned as JSON.
+        """
+        self.set_header("Content-Type", "application/json")
+
+    def is_healthy(self) -> bool:
+        """
+        Returns whether the probe should succeed.
+        """
+        return self.lifecycle.is_alive
+
+    def get(self) -> None:
+        """
+        Handles probe requests, answering with the lifecycle state in JSON format.
+        """
+        self.set_status(self.HTTP_OK if self.is_healthy() else self.HTTP_SERVICE_UNAVAILABLE)
+        self.write({
+            "status": self.lifecycle.state.value,
+            "in_flight": self.lifecycle.in_flight,
+        })
+
+
+class ReadinessHandler(HealthHandler):
+    """
+    ReadinessHandler reports whether the application should receive new uploads.
+    """
+
+    def is_healthy(self) -> bool:
+        """
+        Returns whether the probe should succeed.
+        """
+        return self.lifecycle.is_ready
@@ -0,0 +1,44 @@
+"""
+Module: loop_monitor_handler
+
+This module defines the `LoopMonitorHandler` class, which exposes the IOLoop lag
+histogram and the most recent blocking events captured by the `LoopMonitor`.
+
+Example Use Case:
+    - Inspecting `/debug/loop` to see which route and stack blocked the event loop
+      during a tail-latency incident.
+"""
+from typing import Optional
+
+from infrastructure.monitoring.loop_monitor import LoopMonitor
+from infrastructure.web.handlers.admin_handler import AdminHandler
+
+
+class LoopMonitorHandler(AdminHandler):
+    """
+    LoopMonitorHandler serves the state of a LoopMonitor as JSON.
+    """
+
+    def initialize(self, loop_monitor: LoopMonitor, admin_token: Optional[str]) -> None:
+        """
+        Initializes the handler with the monitor to report on.
+
+        Args:
+            loop_monitor (LoopMonitor): The monitor whose measurements are served.
+            admin_token (Optional[str]): The token requests must present; None or empty
+                                         disables the endpoint.
+        """
+        super().initialize(admin_token)
+        self.loop_monitor = loop_monitor
+
+    def set_default_headers(self) -> None:
+        """
+        Sets default headers to ensure all responses are returned as JSON.
+        """
+        self.set_header("Content-Type", "application/json")
+
+    def get(self) -> None:
+        """
+        Returns the lag histogram and recent blocking events in JSON format.
+        """
+        self.write(self.loop_monitor.snapshot())
@@ -0,0 +1,60 @@
+"""
+Module: profile_handler
+
+This module defines the `ProfileHandler` class, the admin endpoint of the request
+profiler. It reports how many requests were profiled per route, serves the merged
+samples as collapsed stacks for flamegraph tools, and discards them on request.
+
+Example Use Case:
+    - `curl -H "Authorization: Bearer $ADMIN_TOKEN"
+      'http://host/debug/profile?format=collapsed&route=POST FileUploadHandler'
+      | flamegraph.pl > upload.svg` to see where `/upload` spends its time.
+"""
+from typing import Optional
+
+from infrastructure.monitoring.request_profiler import RequestProfiler
+from infrastructure.web.handlers.admin_handler import AdminHandler
+
+
+class ProfileHandler(AdminHandler):
+    """
+    ProfileHandler serves and resets the samples aggregated by a RequestProfiler.
+
+    Attributes:
+        HTTP_NO_CONTENT (int): HTTP status code returned once the samples are reset.
+    """
+
+    HTTP_NO_CONTENT = 204
+
+    def initialize(self, profiler: RequestProfiler, admin_token: Optional[str]) -> None:
+        """
+        Initializes the handler with the profiler to report on.
+
+        Args:
+            profiler (RequestProfiler): The profiler whose samples are served.
+            admin_token (Optional[str]): The token requests must present; None or empty
+                                         disables the endpoint.
+        """
+        super().initialize(admin_token)
+        self.profiler = profiler
+
+    def get(self) -> None:
+        """
+        Returns the per-route profiling counts in JSON format or, with
+        `?format=collapsed`, the samples as collapsed stacks, optionally limited to
+        one route with `?route=`.
+        """
+        if self.get_argument("format", "json") == "collapsed":
+            self.set_header("Content-Type", "text/plain; charset=utf-8")
+            self.write(self.profiler.collapsed(self.get_argument("route", None)))
+        else:
+            self.set_header("Content-Type", "application/json")
+            self.write({"sample_every": self.profiler.sample_every, "header": self.profiler.header,
+                        "routes": self.profiler.stats()})
+
+    def delete(self) -> None:
+        """
+        Discards all aggregated samples.
+        """
+        self.profiler.reset()
+        self.set_status(self.HTTP_NO_CONTENT)
@@ -0,0 +1,46 @@
+"""
+Module: upload_stats_handler
+
+This module defines the `UploadStatsHandler` class, which exposes the contention
+counters of the upload coordinator: how many uploads were written, collapsed into an
+identical upload in flight, made to wait for another writer of the same filename, or
+rejected.
+
+Example Use Case:
+    - Checking `/debug/uploads` during an incident to see whether retried duplicate
+      uploads are being collapsed instead of written again.
+"""
+from typing import Optional
+
+from infrastructure.lifecycle import Lifecycle
+from infrastructure.web.handlers.admin_handler import AdminHandler
+
+
+class UploadStatsHandler(AdminHandler):
+    """
+    UploadStatsHandler serves the upload coordinator's counters as JSON.
+    """
+
+    def initialize(self, lifecycle: Lifecycle, admin_token: Optional[str]) -> None:
+        """
+        Initializes the handler with the application lifecycle.
+
+        Args:
+            lifecycle (Lifecycle): The lifecycle providing the upload coordinator.
+            admin_token (Optional[str]): The token requests must present; None or empty
+                                         disables the endpoint.
+        """
+        super().initialize(admin_token)
+        self.lifecycle = lifecycle
+
+    def set_default_headers(self) -> None:
+        """
+        Sets default headers to ensure all responses are returned as JSON.
+        """
+        self.set_header("Content-Type", "application/json")
+
+    def get(self) -> None:
+        """
+        Returns the contention counters in JSON format.
+        """
+        self.write(self.lifecycle.upload_coordinator.stats())
@@ -1,23 +1,38 @@
 import tornado
 
-from application.upload_use_case import UploadUseCase
-from infrastructure.adapters.db_file_repository import DBFile
-from infrastructure.adapters.websocket_progress_notifier import WebSocketProgressNotifier
+from infrastructure.lifecycle import lifecycle
+from infrastructure.monitoring.loop_monitor import loop_monitor
+from infrastructure.monitoring.request_profiler import request_profiler
+from infrastructure.settings import settings
+from infrastructure.web.handlers.file_stream_handler import FileStreamHandler
 from infrastructure.web.handlers.file_upload_handler import FileUploadHandler
+from infrastructure.web.handlers.health_handler import HealthHandler, ReadinessHandler
+from infrastructure.web.handlers.loop_monitor_handler import LoopMonitorHandler
+from infrastructure.web.handlers.profile_handler import ProfileHandler
+from infrastructure.web.handlers.upload_stats_handler import UploadStatsHandler
 from infrastructure.web.handlers.websocket_handler import ProgressWebSocketHandler
 
-file_repo = DBFile()
-progress_notifier = WebSocketProgressNotifier(ProgressWebSocketHandler)
-upload_use_case = UploadUseCase(file_repo, progress_notifier)
-
 routes = [
     # Return the Tornado application with the following routes:
     # - Redirect from root ("/") to the static HTML file (index.html)
     # - "/upload" for file uploads (handled by FileUploadHandler)
+    # - "/files/{name}" for raw binary PUT uploads streamed to storage (handled by FileStreamHandler)
     # - "/ws/progress" for WebSocket connections to notify clients of progress (handled by ProgressWebSocketHandler)
+    # - "/healthz" and "/readyz" for liveness and readiness probes
+    # - "/debug/*" admin endpoints, which require the ADMIN_TOKEN bearer token:
+    # - "/debug/loop" for IOLoop lag and blocking-call reports
+    # - "/debug/uploads" for contention counters of concurrent uploads of the same filename
+    # - "/debug/profile" for sampled per-route request profiles
     # - "/static" for serving static files like HTML, CSS, and JS
     (r"/", tornado.web.RedirectHandler, {"url": "/static/index.html"}),
-    (r"/upload", FileUploadHandler, dict(upload_use_case=upload_use_case)),
+    (r"/upload", FileUploadHandler, dict(lifecycle=lifecycle, profiler=request_profiler)),
+    (r"/files/(.+)", FileStreamHandler, dict(lifecycle=lifecycle, profiler=request_profiler,
+                                             max_body_size=settings.STREAM_MAX_BODY_SIZE)),
     (r"/ws/progress", ProgressWebSocketHandler),
+    (r"/healthz", HealthHandler, dict(lifecycle=lifecycle)),
+    (r"/readyz", ReadinessHandler, dict(lifecycle=lifecycle)),
+    (r"/debug/loop", LoopMonitorHandler, dict(loop_monitor=loop_monitor, admin_token=settings.ADMIN_TOKEN)),
+    (r"/debug/uploads", UploadStatsHandler, dict(lifecycle=lifecycle, admin_token=settings.ADMIN_TOKEN)),
+    (r"/debug/profile", ProfileHandler, dict(profiler=request_profiler, admin_token=settings.ADMIN_TOKEN)),
     (r"/static/(.*)", tornado.web.StaticFileHandler, {"path": "./static"}),
-]
\ No newline at end of file
+]
@@ -0,0 +1,20 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "files" ADD "upload" VARCHAR(32);
+CREATE TABLE IF NOT EXISTS "file_chunks" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "upload" VARCHAR(32) NOT NULL,
+    "seq" INT NOT NULL,
+    "data" BLOB NOT NULL,
+    CONSTRAINT "uid_file_chunks_upload_seq" UNIQUE ("upload", "seq")
+);
+CREATE INDEX IF NOT EXISTS "idx_file_chunks_upload" ON "file_chunks" ("upload");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "file_chunks";
+ALTER TABLE "files" DROP COLUMN "upload";"""
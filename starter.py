@@ -1,27 +1,41 @@
-import tornado.ioloop
+import asyncio
+import signal
 import tornado.web
 import tracemalloc
 
-from tortoise import Tortoise, run_async
-
-from infrastructure.settings import TORTOISE_ORM, settings
+from infrastructure.lifecycle import lifecycle
+from infrastructure.settings import settings
 from infrastructure.web.urls import routes
 
 # Start tracing memory allocations, storing up to 10 frames per allocation
 tracemalloc.start(settings.TRACE_MEMORY_ALLOCATION_PER_FRAME)
 
-async def db_init():
-    await Tortoise.init(config=TORTOISE_ORM)
-    await Tortoise.generate_schemas()
-    # NOTE: is this a good practice
-
 
 def app():
     return tornado.web.Application(routes)
 
-if __name__ == "__main__":
-    run_async(db_init())
-    app = app()
-    app.listen(8888)
+
+async def main():
+    # Schemas are managed by aerich migrations (`aerich upgrade`), not created on boot.
+    await lifecycle.startup()
+
+    server = app().listen(8888)
     print("Tornado server started on http://localhost:8888")
-    tornado.ioloop.IOLoop.current().start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    # Fail readiness while still listening so load balancers can take the instance out of
+    # rotation, then stop taking new connections and let in-flight uploads drain before
+    # closing the DB.
+    await lifecycle.start_draining()
+    server.stop()
+    await lifecycle.shutdown()
+    await server.close_all_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from application.durability import DurabilityPolicy
+
+
+class FakeRepo:
+    def __init__(self, delay=0.0, error=None):
+        self.calls = []
+        self.delay = delay
+        self.error = error
+
+    async def sync_staged(self, filenames):
+        await self._record("sync_staged", filenames)
+
+    async def sync(self, filenames):
+        await self._record("sync", filenames)
+
+    async def _record(self, method, filenames):
+        self.calls.append((method, list(filenames)))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+
+
+def test_none_never_syncs():
+    repo = FakeRepo()
+    policy = DurabilityPolicy(repo, DurabilityPolicy.NONE)
+
+    async def scenario():
+        await policy.prepare("a")
+        await policy.commit("a")
+
+    asyncio.run(scenario())
+    assert repo.calls == []
+
+
+def test_per_upload_syncs_every_upload_before_and_after_publish():
+    repo = FakeRepo()
+    policy = DurabilityPolicy(repo, DurabilityPolicy.PER_UPLOAD)
+
+    async def scenario():
+        await policy.prepare("a")
+        await policy.commit("a")
+        await policy.commit("b")
+
+    asyncio.run(scenario())
+    assert repo.calls == [("sync_staged", ["a"]), ("sync", ["a"]), ("sync", ["b"])]
+
+
+def test_group_commit_syncs_a_window_of_uploads_once():
+    repo = FakeRepo()
+    policy = DurabilityPolicy(repo, DurabilityPolicy.GROUP_COMMIT, window=0.01)
+
+    async def scenario():
+        await asyncio.gather(*(policy.commit(name) for name in ("b", "a", "b", "c")))
+
+    asyncio.run(scenario())
+    assert repo.calls == [("sync", ["a", "b", "c"])]
+
+
+def test_group_commit_batches_each_step_separately():
+    repo = FakeRepo()
+    policy = DurabilityPolicy(repo, DurabilityPolicy.GROUP_COMMIT, window=0.01)
+
+    async def upload(name):
+        await policy.prepare(name)
+        await policy.commit(name)
+
+    async def scenario():
+        await asyncio.gather(upload("a"), upload("b"))
+
+    asyncio.run(asyncio.wait_for(scenario(), 1))
+    assert repo.calls == [("sync_staged", ["a", "b"]), ("sync", ["a", "b"])]
+
+
+def test_group_commit_sync_failure_reaches_every_waiter():
+    repo = FakeRepo(error=OSError("disk full"))
+    policy = DurabilityPolicy(repo, DurabilityPolicy.GROUP_COMMIT, window=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(policy.commit(name) for name in "abc"), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [OSError] * 3
+    assert len(repo.calls) == 1
+
+
+def test_group_commit_opens_a_new_batch_while_a_flush_runs():
+    repo = FakeRepo(delay=0.05)
+    policy = DurabilityPolicy(repo, DurabilityPolicy.GROUP_COMMIT, window=0.01)
+
+    async def scenario():
+        first = asyncio.ensure_future(policy.commit("a"))
+        await asyncio.sleep(0.02)
+        # The first batch is being flushed; this upload must not wait for a window
+        # that already closed nor be lost, but go into a batch of its own.
+        assert repo.calls == [("sync", ["a"])]
+        second = asyncio.ensure_future(policy.commit("b"))
+        await asyncio.gather(first, second)
+
+    asyncio.run(asyncio.wait_for(scenario(), 1))
+    assert repo.calls == [("sync", ["a"]), ("sync", ["b"])]
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        DurabilityPolicy(FakeRepo(), "always")
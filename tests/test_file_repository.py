@@ -0,0 +1,115 @@
+import asyncio
+import os
+
+from infrastructure.adapters.file_repository import INDEX_FILENAME, File, NameIndex, ShardedLayout
+from infrastructure.management.reshard_uploads import reshard
+
+
+def put(repo, filename, content):
+    async def write():
+        await repo.append_chunk(filename, 0, content, len(content))
+        await repo.publish(filename)
+
+    asyncio.run(write())
+
+
+def read(repo, filename):
+    entity = asyncio.run(repo.get_file(filename))
+    return None if entity is None else entity.content
+
+
+def test_stored_path_is_deterministic_and_follows_depth_and_width():
+    layout = ShardedLayout(depth=3, width=1)
+
+    path = layout.stored_path("report.csv")
+    parts = path.split(os.sep)
+
+    assert path == ShardedLayout(depth=3, width=1).stored_path("report.csv")
+    assert len(parts) == 4
+    assert all(len(part) == 1 for part in parts[:3])
+    assert parts[-1].startswith("".join(parts[:3]))
+    assert path != layout.stored_path("report.csv2")
+
+
+def test_stored_path_cannot_escape_the_upload_directory():
+    path = ShardedLayout().stored_path("../../etc/passwd")
+
+    assert ".." not in path.split(os.sep)
+    assert not os.path.isabs(path)
+
+
+def test_name_index_persists_names(tmp_path):
+    index = NameIndex(str(tmp_path / INDEX_FILENAME))
+    index.set("a", "aa/a")
+    index.set("b", "bb/b")
+    index.set("a", "cc/a")
+    index.checkpoint()
+    index.close()
+
+    index = NameIndex(str(tmp_path / INDEX_FILENAME))
+    assert index.get("a") == "cc/a"
+    assert index.get("missing") is None
+    assert sorted(index.items()) == [("a", "cc/a"), ("b", "bb/b")]
+    index.close()
+
+
+def test_partial_version_is_only_visible_once_published(tmp_path):
+    repo = File(str(tmp_path))
+    put(repo, "a", b"old")
+
+    async def stream():
+        await repo.append_chunk("a", 0, b"ne", None)
+        await repo.append_chunk("a", 2, b"w", None)
+        assert (await repo.get_file("a")).content == b"old"
+        await repo.publish("a")
+
+    asyncio.run(stream())
+    assert read(repo, "a") == b"new"
+
+    asyncio.run(repo.append_chunk("a", 0, b"partial", None))
+    asyncio.run(repo.discard("a"))
+    assert read(repo, "a") == b"new"
+    assert not any(name.endswith(".part") for _, _, names in os.walk(tmp_path) for name in names)
+    asyncio.run(repo.close())
+
+
+def test_reshard_moves_flat_files_into_the_layout(tmp_path):
+    (tmp_path / "legacy.txt").write_bytes(b"legacy")
+
+    assert reshard(str(tmp_path), ShardedLayout()) == 1
+
+    assert not (tmp_path / "legacy.txt").exists()
+    repo = File(str(tmp_path))
+    assert read(repo, "legacy.txt") == b"legacy"
+    assert repo.index.get("legacy.txt") == ShardedLayout().stored_path("legacy.txt")
+    asyncio.run(repo.close())
+
+
+def test_reshard_moves_files_to_a_new_layout_and_prunes_old_directories(tmp_path):
+    repo = File(str(tmp_path), ShardedLayout(depth=2, width=2))
+    put(repo, "a", b"first")
+    put(repo, "b", b"second")
+    old_dirs = {path.split(os.sep)[0] for _, path in repo.index.items()}
+    asyncio.run(repo.close())
+
+    layout = ShardedLayout(depth=1, width=3)
+    assert reshard(str(tmp_path), layout) == 2
+    assert reshard(str(tmp_path), layout) == 0
+
+    repo = File(str(tmp_path), layout)
+    assert read(repo, "a") == b"first"
+    assert read(repo, "b") == b"second"
+    assert all(path == layout.stored_path(name) for name, path in repo.index.items())
+    assert not any((tmp_path / directory).exists() for directory in old_dirs)
+    asyncio.run(repo.close())
+
+
+def test_reshard_dry_run_changes_nothing(tmp_path):
+    (tmp_path / "legacy.txt").write_bytes(b"legacy")
+
+    assert reshard(str(tmp_path), ShardedLayout(), dry_run=True) == 1
+
+    assert (tmp_path / "legacy.txt").read_bytes() == b"legacy"
+    index = NameIndex(str(tmp_path / INDEX_FILENAME))
+    assert index.get("legacy.txt") is None
+    index.close()
@@ -0,0 +1,188 @@
+import asyncio
+import os
+
+from infrastructure.adapters.segment_file_repository import INDEX_FILENAME, SegmentFile
+
+
+def open_repo(directory, segment_size=1000):
+    return SegmentFile(str(directory), segment_size=segment_size, compaction_interval=0)
+
+
+def put(repo, filename, content):
+    async def write():
+        await repo.append_chunk(filename, 0, content, len(content))
+        await repo.publish(filename)
+
+    asyncio.run(write())
+
+
+def read(repo, filename):
+    view = repo.read_view(filename)
+    return None if view is None else bytes(view)
+
+
+def test_staged_version_is_only_visible_once_published(tmp_path):
+    repo = open_repo(tmp_path)
+    put(repo, "a", b"old")
+
+    asyncio.run(repo.append_chunk("a", 0, b"new", 3))
+    assert read(repo, "a") == b"old"
+
+    asyncio.run(repo.publish("a"))
+    assert read(repo, "a") == b"new"
+
+
+def test_discard_keeps_previous_version(tmp_path):
+    repo = open_repo(tmp_path)
+    put(repo, "a", b"old")
+
+    asyncio.run(repo.append_chunk("a", 0, b"partial", None))
+    asyncio.run(repo.discard("a"))
+
+    assert read(repo, "a") == b"old"
+    assert repo._garbage[1] > 0
+
+
+def test_streamed_file_grows_beyond_its_reservation(tmp_path):
+    repo = open_repo(tmp_path)
+
+    async def stream():
+        position = 0
+        for piece in (b"a" * 10, b"b" * 30, b"c" * 100):
+            await repo.append_chunk("s", position, piece, None)
+            position += len(piece)
+        await repo.publish("s")
+
+    asyncio.run(stream())
+    assert read(repo, "s") == b"a" * 10 + b"b" * 30 + b"c" * 100
+
+
+def test_announced_size_reserves_at_most_one_segment(tmp_path):
+    repo = open_repo(tmp_path)
+
+    asyncio.run(repo.append_chunk("s", 0, b"head", 10 * 1024 ** 3))
+
+    assert repo._staging["s"].capacity == repo.segment_size
+    assert os.path.getsize(repo._segment_path(repo._staging["s"].segment)) == repo.segment_size
+
+
+def test_reopen_replays_index(tmp_path):
+    repo = open_repo(tmp_path)
+    put(repo, "a", b"1" * 100)
+    put(repo, "b", b"2" * 100)
+    put(repo, "a", b"3" * 50)
+    asyncio.run(repo.delete_file("b"))
+    asyncio.run(repo.close())
+
+    repo = open_repo(tmp_path)
+    assert read(repo, "a") == b"3" * 50
+    assert read(repo, "b") is None
+
+
+def test_torn_record_is_truncated_on_reopen(tmp_path):
+    repo = open_repo(tmp_path)
+    put(repo, "a", b"1" * 100)
+    asyncio.run(repo.close())
+
+    index_path = os.path.join(tmp_path, INDEX_FILENAME)
+    intact_size = os.path.getsize(index_path)
+    with open(index_path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+
+    repo = open_repo(tmp_path)
+    assert read(repo, "a") == b"1" * 100
+    assert os.path.getsize(index_path) == intact_size
+
+    put(repo, "b", b"2" * 10)
+    asyncio.run(repo.close())
+    repo = open_repo(tmp_path)
+    assert read(repo, "b") == b"2" * 10
+
+
+def test_compaction_moves_live_files_and_deletes_segment(tmp_path):
+    repo = open_repo(tmp_path)
+    for i in range(5):
+        put(repo, f"f{i}", bytes([i]) * 200)
+    for i in range(0, 5, 2):
+        put(repo, f"f{i}", bytes([100 + i]) * 200)
+
+    assert repo.compact() == 1
+    assert not os.path.exists(repo._segment_path(1))
+
+    expected = {f"f{i}": bytes([100 + i if i % 2 == 0 else i]) * 200 for i in range(5)}
+    for name, content in expected.items():
+        assert read(repo, name) == content
+
+    asyncio.run(repo.close())
+    repo = open_repo(tmp_path)
+    for name, content in expected.items():
+        assert read(repo, name) == content
+
+
+def test_compaction_skips_segment_holding_staged_version(tmp_path):
+    repo = open_repo(tmp_path)
+    asyncio.run(repo.append_chunk("staged", 0, b"s" * 100, 100))
+    for i in range(4):
+        put(repo, f"f{i}", bytes([i]) * 200)
+    put(repo, "next", b"n" * 500)
+    for i in range(4):
+        put(repo, f"f{i}", bytes([100 + i]) * 200)
+
+    assert repo.compact() == 0
+    asyncio.run(repo.publish("staged"))
+    assert read(repo, "staged") == b"s" * 100
+
+
+def test_garbage_survives_restart_after_index_rewrite(tmp_path):
+    repo = open_repo(tmp_path)
+    for i in range(5):
+        put(repo, f"f{i}", bytes([i]) * 200)
+    for i in range(0, 5, 2):
+        put(repo, f"f{i}", bytes([100 + i]) * 200)
+    repo.compact()
+    put(repo, "f1", b"x" * 200)
+    garbage = dict(repo._garbage)
+    asyncio.run(repo.close())
+
+    repo = open_repo(tmp_path)
+    assert repo._garbage == garbage
+
+
+def test_retired_mapping_is_closed_once_its_views_are_gone(tmp_path):
+    repo = open_repo(tmp_path)
+    for i in range(5):
+        put(repo, f"f{i}", bytes([i]) * 200)
+    view = repo.read_view("f0")
+    for i in range(5):
+        put(repo, f"f{i}", bytes([100 + i]) * 200)
+
+    assert repo.compact() == 1
+    assert len(repo._retired_maps) == 1
+    assert bytes(view) == b"\x00" * 200
+
+    view.release()
+    repo.compact()
+    assert repo._retired_maps == []
+
+
+def test_compaction_keeps_running_after_a_failed_pass(tmp_path):
+    repo = SegmentFile(str(tmp_path), segment_size=1000, compaction_interval=0.01)
+    passes = []
+
+    def compact():
+        passes.append(1)
+        if len(passes) == 1:
+            raise OSError("disk error")
+
+    repo.compact = compact
+
+    async def scenario():
+        await repo.append_chunk("a", 0, b"data", 4)
+        for _ in range(100):
+            if len(passes) >= 2:
+                break
+            await asyncio.sleep(0.01)
+        await repo.close()
+
+    asyncio.run(scenario())
+    assert len(passes) >= 2
@@ -0,0 +1,51 @@
+from collections import Counter
+
+import pytest
+
+from infrastructure.adapters.sharded_db_file_repository import jump_hash, shard_for
+
+FILENAMES = [f"file-{i}.bin" for i in range(4000)]
+
+
+def test_jump_hash_matches_known_vectors():
+    # Published test vectors of the reference algorithm (e.g. the go-jump package).
+    vectors = [(1, 1, 0), (42, 57, 43), (0xDEAD10CC, 1, 0), (0xDEAD10CC, 666, 361), (256, 1024, 520)]
+
+    assert [jump_hash(key, buckets) for key, buckets, _ in vectors] == [expected for _, _, expected in vectors]
+
+
+def test_jump_hash_stays_in_range():
+    for buckets in (1, 2, 7, 100):
+        assert all(0 <= jump_hash(key * 0x9E3779B97F4A7C15, buckets) < buckets for key in range(500))
+
+
+def test_shard_for_is_deterministic_and_balanced():
+    assignment = [shard_for(name, 4) for name in FILENAMES]
+
+    assert assignment == [shard_for(name, 4) for name in FILENAMES]
+    counts = Counter(assignment)
+    assert sorted(counts) == [0, 1, 2, 3]
+    assert all(abs(count - len(FILENAMES) / 4) < len(FILENAMES) * 0.05 for count in counts.values())
+
+
+def test_growing_shards_only_moves_files_into_the_new_shard():
+    moves = [(shard_for(name, 4), shard_for(name, 5)) for name in FILENAMES]
+    moved = [(source, target) for source, target in moves if source != target]
+
+    assert all(target == 4 for _, target in moved)
+    # Jump hashing moves about 1/5 of the files, evenly taken from every old shard.
+    assert abs(len(moved) - len(FILENAMES) / 5) < len(FILENAMES) * 0.05
+    assert sorted({source for source, _ in moved}) == [0, 1, 2, 3]
+
+
+def test_shrinking_shards_only_moves_files_out_of_the_removed_shard():
+    moves = [(shard_for(name, 5), shard_for(name, 4)) for name in FILENAMES]
+
+    assert all(source == 4 for source, target in moves if source != target)
+    assert all(target != 4 for _, target in moves)
+
+
+@pytest.mark.parametrize("count", [1, 3, 8])
+def test_adding_a_shard_never_moves_files_between_existing_shards(count):
+    for name in FILENAMES[:500]:
+        assert shard_for(name, count + 1) in (shard_for(name, count), count)
@@ -0,0 +1,195 @@
+import asyncio
+
+import pytest
+
+from application.upload_coordinator import UploadConflictError, UploadCoordinator
+
+
+def test_serialize_runs_writers_of_a_filename_one_after_the_other():
+    async def scenario():
+        coordinator = UploadCoordinator(UploadCoordinator.SERIALIZE, UploadCoordinator.DEDUP_OFF)
+        events = []
+
+        async def upload(tag):
+            events.append(f"start {tag}")
+            await asyncio.sleep(0.01)
+            events.append(f"end {tag}")
+
+        await asyncio.gather(*(coordinator.run("f", None, lambda tag=tag: upload(tag)) for tag in "ab"))
+        return coordinator, events
+
+    coordinator, events = asyncio.run(scenario())
+    assert events == ["start a", "end a", "start b", "end b"]
+    assert coordinator.counters["waited"] == 1
+    assert coordinator.stats()["active_filenames"] == 0
+
+
+def test_reject_refuses_a_second_writer():
+    async def scenario():
+        coordinator = UploadCoordinator(UploadCoordinator.REJECT, UploadCoordinator.DEDUP_OFF)
+        first = await coordinator.claim("f")
+        with pytest.raises(UploadConflictError):
+            await coordinator.claim("f")
+        first.release()
+        (await coordinator.claim("f")).release()
+        return coordinator
+
+    coordinator = asyncio.run(scenario())
+    assert coordinator.counters["rejected"] == 1
+    assert coordinator.counters["written"] == 2
+
+
+def test_identical_uploads_share_a_single_write():
+    async def scenario():
+        coordinator = UploadCoordinator()
+        writes = []
+
+        async def upload():
+            writes.append(1)
+            await asyncio.sleep(0.01)
+
+        fingerprint = await coordinator.fingerprint(b"content")
+        await asyncio.gather(*(coordinator.run("f", fingerprint, upload) for _ in range(5)))
+        return coordinator, writes
+
+    coordinator, writes = asyncio.run(scenario())
+    assert writes == [1]
+    assert coordinator.counters["collapsed"] == 4
+    assert coordinator.stats()["active_flights"] == 0
+
+
+def test_leader_failure_propagates_to_followers():
+    async def scenario():
+        coordinator = UploadCoordinator()
+
+        async def failing_upload():
+            await asyncio.sleep(0.01)
+            raise OSError("disk full")
+
+        results = await asyncio.gather(
+            coordinator.run("f", "size:3", failing_upload),
+            coordinator.run("f", "size:3", failing_upload),
+            return_exceptions=True,
+        )
+        return coordinator, results
+
+    coordinator, results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [OSError, OSError]
+    assert coordinator.counters["written"] == 1
+    assert coordinator.stats() == {**coordinator.counters, "active_filenames": 0, "active_flights": 0}
+
+
+def test_cancelled_waiter_fails_its_followers_and_frees_the_filename():
+    async def scenario():
+        coordinator = UploadCoordinator()
+        holder = await coordinator.claim("f")
+
+        waiter = asyncio.ensure_future(coordinator.claim("f", "size:1"))
+        await asyncio.sleep(0)
+        follower = await coordinator.claim("f", "size:1")
+        waiter.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await follower.wait()
+        holder.release()
+
+        # The filename is free again for the next writer.
+        (await asyncio.wait_for(coordinator.claim("f"), 1)).release()
+        return coordinator
+
+    coordinator = asyncio.run(scenario())
+    assert coordinator.stats()["active_filenames"] == 0
+    assert coordinator.stats()["active_flights"] == 0
+
+
+def test_claimed_releases_with_the_context_error():
+    async def scenario():
+        coordinator = UploadCoordinator()
+        with pytest.raises(ValueError):
+            async with coordinator.claimed("f"):
+                raise ValueError("boom")
+        (await asyncio.wait_for(coordinator.claim("f"), 1)).release()
+
+    asyncio.run(scenario())
+
+
+def test_unknown_modes_are_rejected():
+    with pytest.raises(ValueError):
+        UploadCoordinator(conflict_mode="queue")
+    with pytest.raises(ValueError):
+        UploadCoordinator(dedup="name")
+
+
+def test_only_the_newest_upload_of_a_filename_is_joined():
+    async def scenario():
+        coordinator = UploadCoordinator()
+        written = []
+
+        async def upload(content):
+            await asyncio.sleep(0.01)
+            written.append(content)
+
+        fingerprints = {content: await coordinator.fingerprint(content) for content in (b"x", b"y")}
+
+        def run(content):
+            return coordinator.run("f", fingerprints[content], lambda: upload(content))
+
+        # X is still in flight when Y queues behind it, so a second X must not join the
+        # first: it would be acknowledged while the file ends up holding Y.
+        await asyncio.gather(run(b"x"), run(b"y"), run(b"x"))
+        return coordinator, written
+
+    coordinator, written = asyncio.run(scenario())
+    assert written == [b"x", b"y", b"x"]
+    assert coordinator.counters["written"] == 3
+    assert coordinator.counters["collapsed"] == 0
+    assert coordinator.stats()["active_flights"] == 0
+
+
+def test_an_upload_identical_to_the_queued_writer_joins_it():
+    async def scenario():
+        coordinator = UploadCoordinator()
+        written = []
+
+        async def upload(content):
+            await asyncio.sleep(0.01)
+            written.append(content)
+
+        fingerprints = {content: await coordinator.fingerprint(content) for content in (b"x", b"y")}
+
+        def run(content):
+            return coordinator.run("f", fingerprints[content], lambda: upload(content))
+
+        await asyncio.gather(run(b"x"), run(b"y"), run(b"y"))
+        return coordinator, written
+
+    coordinator, written = asyncio.run(scenario())
+    assert written == [b"x", b"y"]
+    assert coordinator.counters["collapsed"] == 1
+
+
+def test_fingerprint_is_only_computed_when_the_filename_is_busy():
+    async def scenario():
+        coordinator = UploadCoordinator()
+        computed = []
+
+        def fingerprint(content):
+            async def compute():
+                computed.append(content)
+                return await coordinator.fingerprint(content)
+            return compute
+
+        async def upload():
+            await asyncio.sleep(0.01)
+
+        await coordinator.run("f", fingerprint(b"a"), upload)
+        assert computed == []
+
+        await asyncio.gather(*(coordinator.run("f", fingerprint(b"b"), upload) for _ in range(3)))
+        return coordinator, computed
+
+    coordinator, computed = asyncio.run(scenario())
+    # The leader's digest is computed once, when the first follower compares against it.
+    assert computed == [b"b"] * 3
+    assert coordinator.counters["collapsed"] == 2
+    assert coordinator.counters["written"] == 2